@@ -4,31 +4,134 @@
 演示各种攻击场景和网络安全防护
 """
 
+import sys
 import time
 import json
+import socket
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 import threading
 import random
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlsplit, quote
+from concurrent.futures import ThreadPoolExecutor, wait, ALL_COMPLETED
+
+try:
+    import aiohttp
+    USE_AIOHTTP = True
+except ImportError:
+    USE_AIOHTTP = False
+
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+try:
+    import httpx
+    import h2  # noqa: F401  httpx 的 HTTP/2 支持依赖 h2
+    USE_HTTPX_H2 = True
+except ImportError:
+    USE_HTTPX_H2 = False
+
+try:
+    import orjson
+    USE_ORJSON = True
+except ImportError:
+    USE_ORJSON = False
 
 # 测试配置
 NODE_URL = "http://127.0.0.1:18345"
 API_TOKEN = None  # 将在运行时获取
 
+LOG_COLORS = {
+    "INFO": "\033[32m",     # 绿色
+    "WARN": "\033[33m",     # 黄色  
+    "ERROR": "\033[31m",    # 红色
+    "ATTACK": "\033[35m\033[1m",  # 紫色粗体
+    "SUCCESS": "\033[92m",  # 亮绿色
+}
+LOG_RESET = "\033[0m"
+
+# 输出被重定向到文件/管道时不写入ANSI颜色码
+_TTY = sys.stdout.isatty()
+_LOG_FORMATS = {
+    level: (color + "[{}] [" + level + "] {}" + LOG_RESET) if _TTY else ("[{}] [" + level + "] {}")
+    for level, color in LOG_COLORS.items()
+}
+
+# 恶意数据注入载荷，GET查询串和POST请求体在加载时预先编码
+MALICIOUS_PAYLOADS = [
+    {"type": payload_type, "payload": payload, "quoted": quote(payload, safe=""),
+     "json_body": json.dumps({"data": payload}).encode('utf-8')}
+    for payload_type, payload in (
+        # SQL注入尝试
+        ("SQL注入", "'; DROP TABLE users; --"),
+        # XSS尝试
+        ("XSS注入", "<script>alert('恶意脚本')</script>"),
+        # 超长数据
+        ("缓冲区溢出", "A" * 10000),
+        # 格式错误JSON
+        ("格式错误JSON", "{'malformed': json}"),
+        # Unicode攻击
+        ("Unicode攻击", "\u0000\u0001\u0002恶意Unicode"),
+    )
+]
+
+# 所有攻击共享的连接池，避免每个请求重新建立TCP连接
+# 注意: token 只通过 self.headers 按请求传入，未授权访问测试依赖会话本身不带 token
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=1, pool_maxsize=64, pool_block=False, max_retries=0)
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
+SESSION.headers["Connection"] = "keep-alive"
+
+# 视为攻击被阻止的状态码
+_BLOCKED_INJECT = frozenset({400, 401, 403, 422, 429})
+_BLOCKED_AUTH = frozenset({401, 403})
+
+# 健康检查只关心状态行，不需要服务端压缩响应体
+IDENTITY_ENCODING = {"Accept-Encoding": "identity"}
+
+# 攻击记录内部保存 time.time() 时间戳，生成报告时再统一格式化
+_TS_KEYS = {"start_ts": "start_time", "end_ts": "end_time"}
+
+def _format_timestamps(result):
+    """将攻击记录中的时间戳转换为ISO格式"""
+    return {
+        _TS_KEYS.get(key, key): datetime.fromtimestamp(value).isoformat() if key in _TS_KEYS else value
+        for key, value in result.items()
+    }
+
+def _rate(numer, denom, good, fair):
+    """计算比率并评级，返回 (比率, 评级, 得分)"""
+    rate = numer / denom if denom > 0 else 0
+    if rate > good:
+        return rate, "好", 100
+    if rate > fair:
+        return rate, "中", 60
+    return rate, "差", 20
+
+def _raw_ping(host, port, path="/health", timeout=2):
+    """裸TCP发送HTTP/1.0请求（关闭Nagle），只解析状态行，返回状态码"""
+    sock = socket.create_connection((host, port), timeout=timeout)
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.sendall(f"GET {path} HTTP/1.0\r\nHost: {host}:{port}\r\n\r\n".encode("ascii"))
+        status_line = sock.recv(256).split(b"\r\n", 1)[0]
+    finally:
+        sock.close()
+    return int(status_line.split()[1])
+
 def log(msg, level="INFO"):
     """彩色日志输出"""
-    colors = {
-        "INFO": "\033[32m",     # 绿色
-        "WARN": "\033[33m",     # 黄色  
-        "ERROR": "\033[31m",    # 红色
-        "ATTACK": "\033[35m\033[1m",  # 紫色粗体
-        "SUCCESS": "\033[92m",  # 亮绿色
-    }
-    reset = "\033[0m"
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    color = colors.get(level, "")
-    print(f"{color}[{timestamp}] [{level}] {msg}{reset}")
+    fmt = _LOG_FORMATS.get(level)
+    if fmt is None:
+        fmt = f"[{{}}] [{level}] {{}}" + (LOG_RESET if _TTY else "")
+    print(fmt.format(time.strftime("%H:%M:%S"), msg))
 
 class MaliciousAttacks:
     def __init__(self, node_url, api_token=None):
@@ -36,18 +139,37 @@ class MaliciousAttacks:
         self.api_token = api_token
         self.headers = {"X-API-Token": api_token} if api_token else {}
         self.results = []
-        
+        self.session = SESSION
+        self.start_epoch = time.time()
+        
+        # 纯HTTP节点的健康检查走裸socket，HTTPS仍使用会话
+        parsed = urlsplit(node_url)
+        self._ping_addr = (parsed.hostname, parsed.port or 80) if parsed.scheme == "http" else None
+        
+        # 响应时间在线累加（总和/次数），不保存逐条记录
+        self._rt_sum = 0.0
+        self._rt_count = 0
+        self._rt_lock = threading.Lock()
+        
+    def _health_status(self, timeout):
+        """探测 /health 并返回状态码（不读取响应体）"""
+        if self._ping_addr:
+            return _raw_ping(*self._ping_addr, timeout=timeout)
+        with self.session.get(f"{self.node_url}/health", headers=IDENTITY_ENCODING,
+                              stream=True, timeout=timeout) as response:
+            return response.status_code
+    
     def test_basic_connectivity(self):
         """测试基本连接性"""
         log("测试基本连接性...", "INFO")
         try:
             # 测试健康检查
-            response = requests.get(f"{self.node_url}/health", timeout=5)
-            log(f"健康检查: {response.status_code}", "SUCCESS" if response.status_code == 200 else "ERROR")
+            status_code = self._health_status(timeout=5)
+            log(f"健康检查: {status_code}", "SUCCESS" if status_code == 200 else "ERROR")
             
             # 测试节点信息
             if self.api_token:
-                response = requests.get(f"{self.node_url}/api/v1/node/info", headers=self.headers, timeout=5)
+                response = self.session.get(f"{self.node_url}/api/v1/node/info", headers=self.headers, timeout=5)
                 log(f"节点信息: {response.status_code}", "SUCCESS" if response.status_code == 200 else "ERROR")
                 if response.status_code == 200:
                     info = response.json()
@@ -64,40 +186,50 @@ class MaliciousAttacks:
         
         attack_result = {
             "attack_type": "DDoS洪水攻击",
-            "start_time": datetime.now().isoformat(),
+            "start_ts": time.time(),
             "requests_sent": 0,
             "successful_requests": 0,
-            "failed_requests": 0,
-            "response_times": []
+            "failed_requests": 0
         }
+        self._rt_sum = 0.0
+        self._rt_count = 0
         
         def send_flood_request():
             try:
                 start_time = time.time()
-                response = requests.get(f"{self.node_url}/health", timeout=2)
+                status_code = self._health_status(timeout=2)
                 response_time = time.time() - start_time
-                
+                ok = status_code == 200
+            except Exception as e:
+                with self._rt_lock:
+                    attack_result["failed_requests"] += 1
+                return
+            
+            with self._rt_lock:
                 attack_result["requests_sent"] += 1
-                if response.status_code == 200:
+                if ok:
                     attack_result["successful_requests"] += 1
-                    attack_result["response_times"].append(response_time)
+                    self._rt_sum += response_time
+                    self._rt_count += 1
                 else:
                     attack_result["failed_requests"] += 1
-                    
-            except Exception as e:
-                attack_result["failed_requests"] += 1
         
         # 发送100个并发请求
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            futures = [executor.submit(send_flood_request) for _ in range(100)]
-            for future in futures:
-                try:
-                    future.result(timeout=1)
-                except:
-                    attack_result["failed_requests"] += 1
+        if USE_HTTPX_H2 and self.node_url.startswith("https://"):
+            asyncio.run(self._flood_h2(100, attack_result))
+        elif USE_AIOHTTP:
+            asyncio.run(self._flood(100, attack_result))
+        else:
+            with ThreadPoolExecutor(max_workers=20) as executor:
+                futures = [executor.submit(send_flood_request) for _ in range(100)]
+                _, not_done = wait(futures, timeout=30, return_when=ALL_COMPLETED)
+                # 未开始的请求直接取消并记为失败，正在执行的会自行计数
+                for future in not_done:
+                    if future.cancel():
+                        attack_result["failed_requests"] += 1
         
-        attack_result["end_time"] = datetime.now().isoformat()
-        attack_result["avg_response_time"] = sum(attack_result["response_times"]) / len(attack_result["response_times"]) if attack_result["response_times"] else 0
+        attack_result["end_ts"] = time.time()
+        attack_result["avg_response_time"] = self._rt_sum / self._rt_count if self._rt_count else 0
         
         self.results.append(attack_result)
         
@@ -110,75 +242,129 @@ class MaliciousAttacks:
         else:
             log("⚠️  网络可能容易受到DDoS攻击", "WARN")
     
+    async def _flood(self, n, attack_result):
+        """在单个事件循环中并发发送n个健康检查请求"""
+        loop = asyncio.get_running_loop()
+        connector = aiohttp.TCPConnector(limit=500, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=2)
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            async def send_flood_request():
+                try:
+                    start_time = loop.time()
+                    async with session.get(f"{self.node_url}/health", headers=IDENTITY_ENCODING) as response:
+                        status = response.status
+                    response_time = loop.time() - start_time
+                    
+                    attack_result["requests_sent"] += 1
+                    if status == 200:
+                        attack_result["successful_requests"] += 1
+                        self._rt_sum += response_time
+                        self._rt_count += 1
+                    else:
+                        attack_result["failed_requests"] += 1
+                        
+                except Exception:
+                    attack_result["failed_requests"] += 1
+            
+            await asyncio.gather(*(send_flood_request() for _ in range(n)))
+    
+    async def _flood_h2(self, n, attack_result):
+        """通过HTTP/2多路复用在少量连接上并发发送n个健康检查请求
+        
+        仅用于HTTPS节点（通过ALPN协商h2），服务端不支持时httpx自动回退到HTTP/1.1
+        """
+        loop = asyncio.get_running_loop()
+        limits = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+        
+        async with httpx.AsyncClient(http2=True, base_url=self.node_url, limits=limits, timeout=2) as client:
+            async def send_flood_request():
+                try:
+                    start_time = loop.time()
+                    async with client.stream("GET", "/health", headers=IDENTITY_ENCODING) as response:
+                        status = response.status_code
+                    response_time = loop.time() - start_time
+                    
+                    attack_result["requests_sent"] += 1
+                    if status == 200:
+                        attack_result["successful_requests"] += 1
+                        self._rt_sum += response_time
+                        self._rt_count += 1
+                    else:
+                        attack_result["failed_requests"] += 1
+                        
+                except Exception:
+                    attack_result["failed_requests"] += 1
+            
+            await asyncio.gather(*(send_flood_request() for _ in range(n)))
+    
     def attack_2_malformed_data(self):
         """攻击2: 恶意数据注入"""
         log("🔥 执行攻击 2: 恶意数据注入", "ATTACK")
         
-        malicious_payloads = [
-            # SQL注入尝试
-            {"payload": "'; DROP TABLE users; --", "type": "SQL注入"},
-            # XSS尝试
-            {"payload": "<script>alert('恶意脚本')</script>", "type": "XSS注入"},
-            # 超长数据
-            {"payload": "A" * 10000, "type": "缓冲区溢出"},
-            # 格式错误JSON
-            {"payload": "{'malformed': json}", "type": "格式错误JSON"},
-            # Unicode攻击
-            {"payload": "\u0000\u0001\u0002恶意Unicode", "type": "Unicode攻击"},
-        ]
-        
         attack_result = {
             "attack_type": "恶意数据注入",
-            "start_time": datetime.now().isoformat(),
+            "start_ts": time.time(),
             "payloads_tested": 0,
             "blocked_attempts": 0,
             "successful_injections": 0,
             "details": []
         }
         
-        for payload_info in malicious_payloads:
+        # 预先构造全部请求
+        endpoints = ["/api/v1/message", "/api/v1/neighbor/add", "/health"]
+        post_headers = {**self.headers, "Content-Type": "application/json"}
+        calls = []
+        for payload_info in MALICIOUS_PAYLOADS:
+            for endpoint in endpoints:
+                if endpoint == "/health":
+                    # GET请求注入
+                    call = partial(self.session.get, f"{self.node_url}{endpoint}?data={payload_info['quoted']}",
+                                   headers=self.headers, timeout=5)
+                else:
+                    # POST请求注入
+                    call = partial(self.session.post, f"{self.node_url}{endpoint}",
+                                   headers=post_headers, data=payload_info['json_body'], timeout=5)
+                calls.append((payload_info['type'], endpoint, call))
+        
+        def send_injection(job):
+            payload_type, endpoint, call = job
             try:
-                # 尝试多个端点
-                endpoints = ["/api/v1/message", "/api/v1/neighbor/add", "/health"]
+                return payload_type, endpoint, call().status_code
+            except requests.exceptions.Timeout:
+                return payload_type, endpoint, None
+            except Exception:
+                return None  # 忽略连接错误
+        
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            outcomes = list(executor.map(send_injection, calls))
+        
+        # 在主线程中汇总结果
+        for outcome in outcomes:
+            if outcome is None:
+                continue
+            payload_type, endpoint, status_code = outcome
+            if status_code is None:
+                attack_result["blocked_attempts"] += 1  # 超时也算被阻止
+                continue
+            
+            attack_result["payloads_tested"] += 1
+            
+            detail = {
+                "payload_type": payload_type,
+                "endpoint": endpoint,
+                "status_code": status_code,
+                "blocked": status_code in _BLOCKED_INJECT
+            }
+            
+            if detail["blocked"]:
+                attack_result["blocked_attempts"] += 1
+            elif status_code == 200:
+                attack_result["successful_injections"] += 1
                 
-                for endpoint in endpoints:
-                    try:
-                        if endpoint == "/health":
-                            # GET请求注入
-                            response = requests.get(f"{self.node_url}{endpoint}?data={payload_info['payload']}", 
-                                                  headers=self.headers, timeout=5)
-                        else:
-                            # POST请求注入
-                            response = requests.post(f"{self.node_url}{endpoint}", 
-                                                   headers=self.headers,
-                                                   json={"data": payload_info['payload']}, 
-                                                   timeout=5)
-                        
-                        attack_result["payloads_tested"] += 1
-                        
-                        detail = {
-                            "payload_type": payload_info['type'],
-                            "endpoint": endpoint,
-                            "status_code": response.status_code,
-                            "blocked": response.status_code in [400, 401, 403, 422, 429]
-                        }
-                        
-                        if detail["blocked"]:
-                            attack_result["blocked_attempts"] += 1
-                        elif response.status_code == 200:
-                            attack_result["successful_injections"] += 1
-                            
-                        attack_result["details"].append(detail)
-                        
-                    except requests.exceptions.Timeout:
-                        attack_result["blocked_attempts"] += 1  # 超时也算被阻止
-                    except Exception as e:
-                        pass  # 忽略连接错误
-                        
-            except Exception as e:
-                pass
+            attack_result["details"].append(detail)
         
-        attack_result["end_time"] = datetime.now().isoformat()
+        attack_result["end_ts"] = time.time()
         self.results.append(attack_result)
         
         log(f"数据注入测试完成: {attack_result['blocked_attempts']}/{attack_result['payloads_tested']} 被阻止", "ATTACK")
@@ -197,7 +383,7 @@ class MaliciousAttacks:
         
         attack_result = {
             "attack_type": "未授权访问",
-            "start_time": datetime.now().isoformat(),
+            "start_ts": time.time(),
             "endpoints_tested": 0,
             "blocked_access": 0,
             "unauthorized_success": 0,
@@ -205,72 +391,64 @@ class MaliciousAttacks:
         }
         
         # 尝试访问受保护的端点
-        protected_endpoints = [
+        protected_endpoints = (
             "/api/v1/admin/config",
             "/api/v1/admin/tokens",
             "/api/v1/admin/shutdown", 
             "/api/v1/node/neighbors/add",
             "/api/v1/node/neighbors/remove",
-            "/api/v1/message/send"
-        ]
-        
-        # 无token访问
-        for endpoint in protected_endpoints:
-            try:
-                response = requests.get(f"{self.node_url}{endpoint}", timeout=5)
-                attack_result["endpoints_tested"] += 1
-                
-                detail = {
-                    "endpoint": endpoint,
-                    "method": "无token",
-                    "status_code": response.status_code,
-                    "blocked": response.status_code in [401, 403]
-                }
-                
-                if detail["blocked"]:
-                    attack_result["blocked_access"] += 1
-                else:
-                    attack_result["unauthorized_success"] += 1
-                    
-                attack_result["details"].append(detail)
-                
-            except:
-                pass
+            "/api/v1/message/send",
+        )
         
-        # 伪造token访问
-        fake_tokens = [
+        # 伪造token
+        fake_tokens = (
             "fake_token_123",
             "admin",
             "root",
             "password",
             "0" * 64,  # 假的长token
-        ]
+        )
         
+        # 预先构造 (端点, 方式, URL, 请求头)：无token访问全部端点，伪造token只测试前3个以节省时间
+        no_token_headers = {}
+        jobs = [(endpoint, "无token", f"{self.node_url}{endpoint}", no_token_headers)
+                for endpoint in protected_endpoints]
         for token in fake_tokens:
             fake_headers = {"X-API-Token": token}
-            for endpoint in protected_endpoints[:3]:  # 只测试前3个以节省时间
-                try:
-                    response = requests.get(f"{self.node_url}{endpoint}", headers=fake_headers, timeout=5)
-                    attack_result["endpoints_tested"] += 1
-                    
-                    detail = {
-                        "endpoint": endpoint,
-                        "method": f"伪造token",
-                        "status_code": response.status_code,
-                        "blocked": response.status_code in [401, 403]
-                    }
-                    
-                    if detail["blocked"]:
-                        attack_result["blocked_access"] += 1
-                    else:
-                        attack_result["unauthorized_success"] += 1
-                        
-                    attack_result["details"].append(detail)
-                    
-                except:
-                    pass
+            jobs.extend((endpoint, "伪造token", f"{self.node_url}{endpoint}", fake_headers)
+                        for endpoint in protected_endpoints[:3])
+        
+        def probe(job):
+            endpoint, method, url, headers = job
+            try:
+                return endpoint, method, self.session.get(url, headers=headers, timeout=5).status_code
+            except:
+                return None
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            outcomes = list(executor.map(probe, jobs))
+        
+        for outcome in outcomes:
+            if outcome is None:
+                continue
+            endpoint, method, status_code = outcome
+            attack_result["endpoints_tested"] += 1
+            
+            detail = {
+                "endpoint": endpoint,
+                "method": method,
+                "status_code": status_code,
+                "blocked": status_code in _BLOCKED_AUTH
+            }
+            
+            if detail["blocked"]:
+                attack_result["blocked_access"] += 1
+            else:
+                attack_result["unauthorized_success"] += 1
+                
+            attack_result["details"].append(detail)
         
-        attack_result["end_time"] = datetime.now().isoformat()
+        attack_result["end_ts"] = time.time()
         self.results.append(attack_result)
         
         log(f"未授权访问测试: {attack_result['blocked_access']}/{attack_result['endpoints_tested']} 被正确阻止", "ATTACK")
@@ -289,33 +467,45 @@ class MaliciousAttacks:
         
         attack_result = {
             "attack_type": "资源耗尽攻击",
-            "start_time": datetime.now().isoformat(),
+            "start_ts": time.time(),
             "long_requests": 0,
             "concurrent_connections": 0,
             "memory_pressure_tests": 0
         }
         
-        # 长时间连接测试
-        def create_long_connection():
-            try:
-                requests.get(f"{self.node_url}/health", stream=True, timeout=30)
-                attack_result["long_requests"] += 1
-            except:
-                pass
+        # 创建多个长连接（单线程异步socket，不再为每个连接占用一个线程）
+        attack_result["long_requests"] += asyncio.run(self._hold_connections(20, timeout=30))
         
-        # 创建多个长连接
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = [executor.submit(create_long_connection) for _ in range(20)]
-            for future in futures:
-                try:
-                    future.result(timeout=5)
-                except:
-                    pass
-        
-        attack_result["end_time"] = datetime.now().isoformat()
+        attack_result["end_ts"] = time.time()
         self.results.append(attack_result)
         log("资源耗尽攻击完成", "ATTACK")
         
+    async def _hold_connections(self, n, timeout):
+        """同时建立n个连接并发送请求，只读取状态行，全部建立后再统一关闭，返回成功数"""
+        parsed = urlsplit(self.node_url)
+        use_ssl = parsed.scheme == "https"
+        host = parsed.hostname
+        port = parsed.port or (443 if use_ssl else 80)
+        request = f"GET /health HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode("ascii")
+        
+        async def open_long_connection():
+            reader, writer = await asyncio.open_connection(host, port, ssl=use_ssl)
+            writer.write(request)
+            await writer.drain()
+            await reader.readline()
+            return writer
+        
+        results = await asyncio.gather(
+            *(asyncio.wait_for(open_long_connection(), timeout) for _ in range(n)),
+            return_exceptions=True
+        )
+        writers = [w for w in results if isinstance(w, asyncio.StreamWriter)]
+        for writer in writers:
+            writer.close()
+        # 等待传输层真正关闭（https 需完成 SSL 关闭），避免事件循环结束时留下未关闭的连接
+        await asyncio.gather(*(w.wait_closed() for w in writers), return_exceptions=True)
+        return len(writers)
+    
     def generate_security_report(self):
         """生成安全分析报告"""
         log("📊 生成安全分析报告", "INFO")
@@ -326,38 +516,43 @@ class MaliciousAttacks:
                 "total_attacks": len(self.results),
                 "node_url": self.node_url
             },
-            "attacks": self.results,
+            "attacks": [_format_timestamps(r) for r in self.results],
             "security_analysis": {},
             "recommendations": []
         }
         
         # 安全分析
+        scores = []
+        
         ddos_attacks = [r for r in self.results if r.get("attack_type") == "DDoS洪水攻击"]
         if ddos_attacks:
             ddos = ddos_attacks[0]
-            fail_rate = ddos["failed_requests"] / ddos["requests_sent"] if ddos["requests_sent"] > 0 else 0
+            fail_rate, rating, score = _rate(ddos["failed_requests"], ddos["requests_sent"], 0.5, 0.2)
             report["security_analysis"]["ddos_resistance"] = {
                 "fail_rate": fail_rate,
-                "rating": "好" if fail_rate > 0.5 else "中" if fail_rate > 0.2 else "差"
+                "rating": rating
             }
+            scores.append(score)
         
         injection_attacks = [r for r in self.results if r.get("attack_type") == "恶意数据注入"]
         if injection_attacks:
             injection = injection_attacks[0]
-            block_rate = injection["blocked_attempts"] / injection["payloads_tested"] if injection["payloads_tested"] > 0 else 0
+            block_rate, rating, score = _rate(injection["blocked_attempts"], injection["payloads_tested"], 0.8, 0.5)
             report["security_analysis"]["input_validation"] = {
                 "block_rate": block_rate,
-                "rating": "好" if block_rate > 0.8 else "中" if block_rate > 0.5 else "差"
+                "rating": rating
             }
+            scores.append(score)
         
         auth_attacks = [r for r in self.results if r.get("attack_type") == "未授权访问"]
         if auth_attacks:
             auth = auth_attacks[0]
-            block_rate = auth["blocked_access"] / auth["endpoints_tested"] if auth["endpoints_tested"] > 0 else 0
+            block_rate, rating, score = _rate(auth["blocked_access"], auth["endpoints_tested"], 0.9, 0.7)
             report["security_analysis"]["access_control"] = {
                 "block_rate": block_rate,
-                "rating": "好" if block_rate > 0.9 else "中" if block_rate > 0.7 else "差"
+                "rating": rating
             }
+            scores.append(score)
         
         # 生成建议
         for category, analysis in report["security_analysis"].items():
@@ -373,17 +568,18 @@ class MaliciousAttacks:
             report["recommendations"].append("网络安全防护表现良好")
         
         # 计算总体安全得分
-        ratings = [analysis["rating"] for analysis in report["security_analysis"].values()]
-        score_map = {"好": 100, "中": 60, "差": 20}
-        if ratings:
-            avg_score = sum(score_map[rating] for rating in ratings) / len(ratings)
-            report["security_analysis"]["overall_score"] = avg_score
+        if scores:
+            report["security_analysis"]["overall_score"] = sum(scores) / len(scores)
         
         # 保存报告
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(self.start_epoch))
         report_file = f"security_test_report_{timestamp}.json"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        if USE_ORJSON:
+            with open(report_file, 'wb') as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
         
         log(f"安全报告已保存: {report_file}", "SUCCESS")
         
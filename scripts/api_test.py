@@ -12,10 +12,11 @@ AgentNetwork API 测试脚本
 import json
 import time
 import argparse
-import urllib.request
-import urllib.error
+import http.client
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 
 # ============ 配置 ============
@@ -23,6 +24,8 @@ from datetime import datetime
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_PORT = 18000
 TIMEOUT = 10
+# 连接被服务端关闭时可安全重试的请求方法
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "DELETE"})
 
 # ============ 测试框架 ============
 
@@ -44,41 +47,63 @@ class APIClient:
             "X-NodeID": "test-client",
             "X-Timestamp": str(int(time.time()))
         }
+        # 长连接，所有请求复用同一个socket
+        self.conn = http.client.HTTPConnection(host, port, timeout=TIMEOUT)
     
-    def request(self, method: str, endpoint: str, data: dict = None) -> tuple:
-        """发送HTTP请求"""
-        url = f"{self.base_url}{endpoint}"
-        
+    def __del__(self):
+        conn = getattr(self, "conn", None)
+        if conn is not None:
+            conn.close()
+    
+    def _send(self, method: str, endpoint: str, body: Optional[bytes]) -> tuple:
+        """在长连接上发送请求并读取完整响应"""
+        self.conn.request(method, endpoint, body=body, headers=self.headers)
+        resp = self.conn.getresponse()
+        return resp.status, resp.reason, resp.read()
+    
+    def request(self, method: str, endpoint: str, data: Union[dict, bytes] = None) -> tuple:
+        """发送HTTP请求（data 可以是已编码的JSON bytes）"""
         try:
-            if data:
+            if isinstance(data, bytes):
+                body = data
+            elif data:
                 body = json.dumps(data).encode('utf-8')
             else:
                 body = None
             
-            req = urllib.request.Request(url, data=body, headers=self.headers, method=method)
-            
-            with urllib.request.urlopen(req, timeout=TIMEOUT) as resp:
-                status = resp.status
-                response = json.loads(resp.read().decode('utf-8'))
-                return status, response, None
-                
-        except urllib.error.HTTPError as e:
             try:
-                response = json.loads(e.read().decode('utf-8'))
-            except:
-                response = {"error": str(e)}
-            return e.code, response, str(e)
+                status, reason, raw = self._send(method, endpoint, body)
+            except (http.client.BadStatusLine, ConnectionResetError, BrokenPipeError):
+                # 服务端关闭了空闲连接，重连后重试一次。
+                # 只重试幂等请求：POST 可能已被服务端处理，重发会造成重复提交
+                self.conn.close()
+                if method not in IDEMPOTENT_METHODS:
+                    raise
+                status, reason, raw = self._send(method, endpoint, body)
             
-        except urllib.error.URLError as e:
+            if status >= 400:
+                err = f"HTTP Error {status}: {reason}"
+                try:
+                    response = json.loads(raw.decode('utf-8'))
+                except:
+                    response = {"error": err}
+                return status, response, err
+            
+            response = json.loads(raw.decode('utf-8'))
+            return status, response, None
+            
+        except OSError as e:
+            self.conn.close()
             return 0, None, f"Connection failed: {e}"
             
         except Exception as e:
+            self.conn.close()
             return 0, None, str(e)
     
     def get(self, endpoint: str) -> tuple:
         return self.request("GET", endpoint)
     
-    def post(self, endpoint: str, data: dict = None) -> tuple:
+    def post(self, endpoint: str, data: Union[dict, bytes] = None) -> tuple:
         return self.request("POST", endpoint, data)
     
     def delete(self, endpoint: str) -> tuple:
@@ -91,12 +116,12 @@ class TestRunner:
         self.client = client
         self.results: List[TestResult] = []
     
-    def run_test(self, name: str, test_func) -> TestResult:
-        """运行单个测试"""
+    def execute(self, name: str, test_func) -> TestResult:
+        """执行单个测试（不记录、不打印）"""
         start = time.time()
         try:
             passed, message, response = test_func()
-            result = TestResult(
+            return TestResult(
                 name=name,
                 passed=passed,
                 message=message,
@@ -104,31 +129,95 @@ class TestRunner:
                 response=response
             )
         except Exception as e:
-            result = TestResult(
+            return TestResult(
                 name=name,
                 passed=False,
                 message=f"Exception: {str(e)}",
                 duration=time.time() - start
             )
-        
+    
+    def report(self, result: TestResult):
+        """记录并打印测试结果"""
         self.results.append(result)
         
-        # 打印结果
         status = "✓" if result.passed else "✗"
         color = "\033[32m" if result.passed else "\033[31m"
         reset = "\033[0m"
-        print(f"  {color}{status}{reset} {name} ({result.duration:.3f}s)")
+        print(f"  {color}{status}{reset} {result.name} ({result.duration:.3f}s)")
         if not result.passed:
             print(f"    └─ {result.message}")
-        
+    
+    def run_test(self, name: str, test_func) -> TestResult:
+        """运行单个测试"""
+        result = self.execute(name, test_func)
+        self.report(result)
         return result
     
+    def run_suites(self, suites, client_factory, max_workers: int = 10):
+        """并发运行只读测试，写操作测试随后顺序执行，按套件顺序输出结果"""
+        jobs = [(suite_name, test_name, test_func)
+                for suite_name, tests in suites
+                for test_name, test_func in tests]
+        results = {}
+        
+        # 每个线程使用独立的客户端，避免在同一个连接上串行
+        local = threading.local()
+        
+        def run_with_thread_client(test_func):
+            if not hasattr(local, "client"):
+                local.client = client_factory()
+            return test_func(local.client)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.execute, test_name,
+                                lambda f=test_func: run_with_thread_client(f)): (suite_name, test_name)
+                for suite_name, test_name, test_func in jobs
+                if test_func not in SEQUENTIAL_TESTS
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        
+        for suite_name, test_name, test_func in jobs:
+            if test_func in SEQUENTIAL_TESTS:
+                results[(suite_name, test_name)] = self.execute(
+                    test_name, lambda f=test_func: f(self.client))
+        
+        current_suite = None
+        for suite_name, test_name, _ in jobs:
+            if suite_name != current_suite:
+                print(f"\n[{suite_name}]")
+                current_suite = suite_name
+            self.report(results[(suite_name, test_name)])
+    
     def summary(self) -> tuple:
         """汇总测试结果"""
         passed = sum(1 for r in self.results if r.passed)
         total = len(self.results)
         return passed, total
 
+# ============ 测试数据 ============
+
+# 固定的请求体只在加载时编码一次
+MAILBOX_SEND_BODY = json.dumps({
+    "to": "test-recipient",
+    "subject": "Test Message",
+    "content": "This is a test message from API test"
+}).encode('utf-8')
+
+BULLETIN_PUBLISH_BODY = json.dumps({
+    "topic": "test",
+    "title": "Test Bulletin",
+    "content": "This is a test bulletin from API test",
+    "tags": ["test", "api"]
+}).encode('utf-8')
+
+MESSAGE_SEND_BODY = json.dumps({
+    "to": "test-peer",
+    "type": "test",
+    "payload": {"message": "hello"}
+}).encode('utf-8')
+
 # ============ 测试用例 ============
 
 def test_health_check(client: APIClient):
@@ -189,12 +278,7 @@ def test_mailbox_inbox(client: APIClient):
 
 def test_mailbox_send(client: APIClient):
     """测试发送邮件"""
-    data = {
-        "to": "test-recipient",
-        "subject": "Test Message",
-        "content": "This is a test message from API test"
-    }
-    status, resp, err = client.post("/api/v1/mailbox/send", data)
+    status, resp, err = client.post("/api/v1/mailbox/send", MAILBOX_SEND_BODY)
     if err:
         return False, err, None
     # 允许200或201
@@ -213,13 +297,7 @@ def test_bulletin_list(client: APIClient):
 
 def test_bulletin_publish(client: APIClient):
     """测试发布公告"""
-    data = {
-        "topic": "test",
-        "title": "Test Bulletin",
-        "content": "This is a test bulletin from API test",
-        "tags": ["test", "api"]
-    }
-    status, resp, err = client.post("/api/v1/bulletin/publish", data)
+    status, resp, err = client.post("/api/v1/bulletin/publish", BULLETIN_PUBLISH_BODY)
     if err:
         return False, err, None
     if status not in [200, 201]:
@@ -301,12 +379,7 @@ def test_invalid_endpoint(client: APIClient):
 
 def test_message_send(client: APIClient):
     """测试发送消息"""
-    data = {
-        "to": "test-peer",
-        "type": "test",
-        "payload": {"message": "hello"}
-    }
-    status, resp, err = client.post("/api/v1/message/send", data)
+    status, resp, err = client.post("/api/v1/message/send", MESSAGE_SEND_BODY)
     if err:
         return False, err, None
     # 可能返回各种状态（peer不存在等）
@@ -383,6 +456,13 @@ ERROR_TESTS = [
     ("无效端点(404)", test_invalid_endpoint),
 ]
 
+# 有写操作的测试不参与并发，在只读测试之后顺序执行
+SEQUENTIAL_TESTS = {
+    test_mailbox_send,
+    test_bulletin_publish,
+    test_message_send,
+}
+
 ALL_TEST_SUITES = [
     ("基础API", BASIC_TESTS),
     ("邻居管理", NEIGHBOR_TESTS),
@@ -408,6 +488,7 @@ def main():
     parser.add_argument("--all", action="store_true", help="运行所有测试")
     parser.add_argument("--suite", help="运行特定测试套件")
     parser.add_argument("--list", action="store_true", help="列出测试套件")
+    parser.add_argument("--workers", type=int, default=10, help="并发测试线程数")
     args = parser.parse_args()
     
     if args.list:
@@ -447,10 +528,8 @@ def main():
         suites = ALL_TEST_SUITES
     
     # 运行测试
-    for suite_name, tests in suites:
-        print(f"\n[{suite_name}]")
-        for test_name, test_func in tests:
-            runner.run_test(test_name, lambda f=test_func: f(client))
+    runner.run_suites(suites, lambda: APIClient(args.host, args.port),
+                      max_workers=max(1, args.workers))
     
     # 汇总
     passed, total = runner.summary()
@@ -8,14 +8,42 @@ import os
 import sys
 import json
 import time
+import shlex
 import shutil
+import stat
 import subprocess
 import argparse
+import functools
 import hashlib
+import threading
+import zipfile
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+
+try:
+    import psutil
+    USE_PSUTIL = True
+except ImportError:
+    USE_PSUTIL = False
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+
+    def _dumps_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _dumps_pretty(obj):
+        return json.dumps(obj, indent=2).encode("utf-8")
 
 # 项目根目录
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -25,6 +53,12 @@ DIST_DIR = PROJECT_ROOT / "dist"
 WEB_ADMIN_DIR = PROJECT_ROOT / "web" / "admin"
 STATIC_DIR = PROJECT_ROOT / "internal" / "webadmin" / "static"
 
+# 打包时需要压缩的文件类型
+COMPRESSIBLE_SUFFIXES = (".md", ".json")
+
+# 节点状态缓存时间（秒）
+STATUS_CACHE_TTL = 1.0
+
 
 class Colors:
     """终端颜色"""
@@ -38,36 +72,145 @@ class Colors:
     BOLD = '\033[1m'
 
 
+_LEVEL_COLORS = {
+    "INFO": Colors.CYAN,
+    "SUCCESS": Colors.GREEN,
+    "WARNING": Colors.WARNING,
+    "ERROR": Colors.FAIL,
+    "HEADER": Colors.HEADER
+}
+
+# 输出被重定向时不写入 ANSI 颜色码
+_TTY = sys.stdout.isatty()
+_COLOR_END = Colors.END if _TTY else ""
+
+
 def log(msg, level="INFO"):
     """日志输出"""
-    colors = {
-        "INFO": Colors.CYAN,
-        "SUCCESS": Colors.GREEN,
-        "WARNING": Colors.WARNING,
-        "ERROR": Colors.FAIL,
-        "HEADER": Colors.HEADER
-    }
-    color = colors.get(level, Colors.END)
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    print(f"{color}[{timestamp}] [{level}] {msg}{Colors.END}")
+    color = _LEVEL_COLORS.get(level, Colors.END) if _TTY else ""
+    print(f"{color}[{time.strftime('%H:%M:%S')}] [{level}] {msg}{_COLOR_END}")
+
+
+def _remove_path(path):
+    """删除文件、符号链接或目录"""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+
+def _newest_mtime(path):
+    """返回路径（递归）下最新的修改时间 (ns)，不存在时返回 0"""
+    try:
+        newest = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+    if not os.path.isdir(path):
+        return newest
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                newest = max(newest, _newest_mtime(entry.path))
+            else:
+                newest = max(newest, entry.stat(follow_symlinks=False).st_mtime_ns)
+    return newest
+
+
+def _mirror(src, dst):
+    """将 src 目录镜像到 dst：跳过大小和修改时间相同的文件，
+    同一文件系统上用硬链接代替复制，并删除 dst 中多余的文件"""
+    os.makedirs(dst, exist_ok=True)
+    seen = set()
+    with os.scandir(src) as entries:
+        for entry in entries:
+            seen.add(entry.name)
+            dst_path = os.path.join(dst, entry.name)
+            
+            if entry.is_dir(follow_symlinks=False):
+                if os.path.lexists(dst_path) and not os.path.isdir(dst_path):
+                    os.unlink(dst_path)
+                _mirror(entry.path, dst_path)
+                continue
+            
+            src_stat = entry.stat()
+            try:
+                dst_stat = os.stat(dst_path, follow_symlinks=False)
+            except FileNotFoundError:
+                dst_stat = None
+            if dst_stat is not None:
+                if (not stat.S_ISDIR(dst_stat.st_mode)
+                        and dst_stat.st_size == src_stat.st_size
+                        and dst_stat.st_mtime_ns == src_stat.st_mtime_ns):
+                    continue
+                _remove_path(dst_path)
+            
+            try:
+                os.link(entry.path, dst_path)
+            except OSError:
+                shutil.copy2(entry.path, dst_path)
+    
+    for name in os.listdir(dst):
+        if name not in seen:
+            _remove_path(os.path.join(dst, name))
 
 
 def run_command(cmd, cwd=None, capture=False):
-    """执行命令"""
+    """执行命令（不经过 shell），cmd 可以是参数列表或命令字符串"""
     if cwd is None:
         cwd = PROJECT_ROOT
     
-    log(f"执行: {cmd}", "INFO")
+    if isinstance(cmd, str):
+        cmd = shlex.split(cmd, posix=os.name != 'nt')
     
-    if capture:
-        result = subprocess.run(
-            cmd, shell=True, cwd=cwd,
-            capture_output=True, text=True
-        )
-        return result
-    else:
-        result = subprocess.run(cmd, shell=True, cwd=cwd)
-        return result
+    log(f"执行: {subprocess.list2cmdline(cmd)}", "INFO")
+    
+    # 解析可执行文件路径（Windows 上可找到 pnpm.cmd 等脚本）
+    exe = shutil.which(cmd[0])
+    if exe:
+        cmd = [exe] + list(cmd[1:])
+    
+    try:
+        if capture:
+            result = subprocess.run(
+                cmd, cwd=cwd,
+                capture_output=True, text=True
+            )
+            return result
+        else:
+            result = subprocess.run(cmd, cwd=cwd)
+            return result
+    except FileNotFoundError as e:
+        return subprocess.CompletedProcess(cmd, 127, "", str(e)) if capture else subprocess.CompletedProcess(cmd, 127)
+
+
+def _fmt_ts(ns):
+    """将纳秒时间戳格式化为本地时间字符串"""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(ns / 1e9))
+
+
+@functools.lru_cache(maxsize=1)
+def _git_commit(head_key):
+    """获取当前提交的短 SHA，按 HEAD 状态缓存，避免重复调用 git"""
+    result = run_command(["git", "rev-parse", "--short", "HEAD"], capture=True)
+    return result.stdout.strip() if result.returncode == 0 else "unknown"
+
+
+def _git_head_key():
+    """HEAD 及其指向的分支引用的修改时间，提交或切换分支后会变化"""
+    git_dir = PROJECT_ROOT / ".git"
+    head = git_dir / "HEAD"
+    try:
+        head_stat = head.stat()
+        content = head.read_text().strip()
+    except OSError:
+        return (0, 0)
+    ref_mtime = 0
+    if content.startswith("ref: "):
+        try:
+            ref_mtime = (git_dir / content[5:]).stat().st_mtime_ns
+        except OSError:
+            pass
+    return (head_stat.st_mtime_ns, ref_mtime)
 
 
 class ClusterManager:
@@ -76,19 +219,56 @@ class ClusterManager:
     def __init__(self):
         self.nodes = {}
         self.config_file = DATA_DIR / "cluster_config.json"
+        self._config_lock = threading.Lock()
+        # 节点可执行文件路径只解析一次，构建后通过 _refresh_exe 更新
+        self._exe_name = "node.exe" if os.name == 'nt' else "node"
+        self._exe_path = BUILD_DIR / self._exe_name
+        self._refresh_exe()
+        # 节点状态短期缓存: node_id -> (monotonic 时间, 状态)
+        self._status_cache = {}
         self.load_config()
+        # 复用的探测线程池，避免每次查询都重新创建线程
+        self._probe_pool = ThreadPoolExecutor(
+            max_workers=min(32, len(self.nodes) or 8),
+            thread_name_prefix="probe"
+        )
+        # 所有 API 调用共享的 HTTP 连接池 (keep-alive)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+        self.session.mount("http://", adapter)
+    
+    def _refresh_exe(self):
+        """重新检查节点可执行文件是否存在"""
+        self._exe_exists = self._exe_path.exists()
     
     def load_config(self):
         """加载集群配置"""
         if self.config_file.exists():
-            with open(self.config_file) as f:
-                self.nodes = json.load(f)
+            self.nodes = _loads(self.config_file.read_bytes())
+            for node in self.nodes.values():
+                self._cache_node_fields(node)
     
     def save_config(self):
-        """保存集群配置"""
+        """保存集群配置（不保存以 _ 开头的运行时缓存字段）"""
         DATA_DIR.mkdir(parents=True, exist_ok=True)
-        with open(self.config_file, 'w') as f:
-            json.dump(self.nodes, f, indent=2)
+        with self._config_lock:
+            nodes = {
+                node_id: {k: v for k, v in node.items() if not k.startswith("_")}
+                for node_id, node in self.nodes.items()
+            }
+            # 先写临时文件再原子替换，避免崩溃时留下不完整的 JSON
+            tmp_file = self.config_file.with_suffix(".json.tmp")
+            tmp_file.write_bytes(_dumps_pretty(nodes))
+            os.replace(tmp_file, self.config_file)
+    
+    @staticmethod
+    def _cache_node_fields(node):
+        """预先计算节点的 URL 前缀和认证请求头"""
+        node["_url_base"] = f"http://localhost:{node['admin_port']}"
+        node["_auth_header"] = {
+            "Authorization": f"Bearer {node['token']}",
+            "Content-Type": "application/json"
+        } if node.get("token") else None
     
     # ==================== 构建相关 ====================
     
@@ -100,26 +280,39 @@ class ClusterManager:
             log("前端目录不存在", "ERROR")
             return False
         
-        # 安装依赖
-        log("安装前端依赖...", "INFO")
-        result = run_command("pnpm install", cwd=WEB_ADMIN_DIR)
-        if result.returncode != 0:
-            log("安装前端依赖失败", "ERROR")
-            return False
+        # 安装依赖：node_modules 比 lockfile 和 package.json 新时跳过
+        modules_marker = WEB_ADMIN_DIR / "node_modules" / ".modules.yaml"
+        deps_mtime = max(_newest_mtime(WEB_ADMIN_DIR / "pnpm-lock.yaml"),
+                         _newest_mtime(WEB_ADMIN_DIR / "package.json"))
+        if modules_marker.exists() and _newest_mtime(modules_marker) >= deps_mtime:
+            log("前端依赖未变化，跳过安装", "INFO")
+        else:
+            log("安装前端依赖...", "INFO")
+            result = run_command(["pnpm", "install"], cwd=WEB_ADMIN_DIR)
+            if result.returncode != 0:
+                log("安装前端依赖失败", "ERROR")
+                return False
         
-        # 构建
-        log("构建前端...", "INFO")
-        result = run_command("pnpm build", cwd=WEB_ADMIN_DIR)
-        if result.returncode != 0:
-            log("构建前端失败", "ERROR")
-            return False
+        # 构建：dist 比所有源文件（src、public 及顶层配置文件）新时跳过
+        dist_dir = WEB_ADMIN_DIR / "dist"
+        sources_mtime = max(_newest_mtime(WEB_ADMIN_DIR / "src"),
+                            _newest_mtime(WEB_ADMIN_DIR / "public"))  # public 不存在时为 0
+        with os.scandir(WEB_ADMIN_DIR) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    sources_mtime = max(sources_mtime, entry.stat().st_mtime_ns)
+        if dist_dir.exists() and _newest_mtime(dist_dir) > sources_mtime:
+            log("前端源码未变化，跳过构建", "INFO")
+        else:
+            log("构建前端...", "INFO")
+            result = run_command(["pnpm", "build"], cwd=WEB_ADMIN_DIR)
+            if result.returncode != 0:
+                log("构建前端失败", "ERROR")
+                return False
         
         # 复制到 static 目录
-        dist_dir = WEB_ADMIN_DIR / "dist"
         if dist_dir.exists():
-            if STATIC_DIR.exists():
-                shutil.rmtree(STATIC_DIR)
-            shutil.copytree(dist_dir, STATIC_DIR)
+            _mirror(dist_dir, STATIC_DIR)
             log(f"前端文件已复制到 {STATIC_DIR}", "SUCCESS")
         
         return True
@@ -132,18 +325,16 @@ class ClusterManager:
         
         # 获取版本信息
         version = datetime.now().strftime("%Y%m%d")
-        commit = "unknown"
-        result = run_command("git rev-parse --short HEAD", capture=True)
-        if result.returncode == 0:
-            commit = result.stdout.strip()
+        commit = _git_commit(_git_head_key())
         
         # 构建
         ldflags = f'-X main.Version={version} -X main.Commit={commit}'
         output_path = BUILD_DIR / f"{output_name}.exe" if os.name == 'nt' else BUILD_DIR / output_name
         
-        cmd = f'go build -ldflags="{ldflags}" -o "{output_path}" ./cmd/node/main.go'
+        cmd = ["go", "build", f"-ldflags={ldflags}", "-o", str(output_path), "./cmd/node/main.go"]
         result = run_command(cmd)
         
+        self._refresh_exe()
         if result.returncode == 0:
             log(f"构建成功: {output_path}", "SUCCESS")
             return True
@@ -183,11 +374,8 @@ class ClusterManager:
         package_dir.mkdir()
         
         # 复制文件
-        exe_name = "node.exe" if os.name == 'nt' else "node"
-        exe_path = BUILD_DIR / exe_name
-        
-        if exe_path.exists():
-            shutil.copy(exe_path, package_dir / exe_name)
+        if self._exe_exists:
+            shutil.copy(self._exe_path, package_dir / self._exe_name)
         
         # 复制配置示例
         config_example = PROJECT_ROOT / "config.example.json"
@@ -200,15 +388,20 @@ class ClusterManager:
             if doc_path.exists():
                 shutil.copy(doc_path, package_dir / doc)
         
-        # 创建压缩包
-        shutil.make_archive(str(DIST_DIR / package_name), 'zip', DIST_DIR, package_name)
+        # 创建压缩包：文本文档压缩，二进制等难以压缩的文件直接存储
+        with zipfile.ZipFile(f"{DIST_DIR / package_name}.zip", "w", allowZip64=True) as zf:
+            for root, _, files in os.walk(package_dir):
+                for name in files:
+                    full_path = os.path.join(root, name)
+                    compress_type = zipfile.ZIP_DEFLATED if name.endswith(COMPRESSIBLE_SUFFIXES) else zipfile.ZIP_STORED
+                    zf.write(full_path, os.path.relpath(full_path, DIST_DIR), compress_type=compress_type)
         
         log(f"打包完成: {DIST_DIR / package_name}.zip", "SUCCESS")
         return True
     
     # ==================== 节点管理 ====================
     
-    def init_node(self, node_id, admin_port, http_port, grpc_port, role="normal"):
+    def init_node(self, node_id, admin_port, http_port, grpc_port, role="normal", save=True):
         """初始化单个节点"""
         node_dir = DATA_DIR / f"node{node_id}"
         node_dir.mkdir(parents=True, exist_ok=True)
@@ -225,8 +418,10 @@ class ClusterManager:
             "token": None
         }
         
+        self._cache_node_fields(node_config)
         self.nodes[str(node_id)] = node_config
-        self.save_config()
+        if save:
+            self.save_config()
         
         log(f"节点 {node_id} 初始化完成", "SUCCESS")
         return node_config
@@ -242,57 +437,72 @@ class ClusterManager:
                 admin_port=base_admin_port + i - 1,
                 http_port=base_http_port + i - 1,
                 grpc_port=base_grpc_port + i - 1,
-                role=role
+                role=role,
+                save=False
             )
+        self.save_config()
         
         log(f"集群初始化完成，共 {num_nodes} 个节点", "SUCCESS")
     
-    def start_node(self, node_id):
+    def start_node(self, node_id, save=True):
         """启动单个节点"""
         node = self.nodes.get(str(node_id))
         if not node:
             log(f"节点 {node_id} 不存在", "ERROR")
             return False
         
-        exe_path = BUILD_DIR / ("node.exe" if os.name == 'nt' else "node")
-        if not exe_path.exists():
-            exe_path = "go run ./cmd/node/main.go start"
+        if not self._exe_exists:
+            cmd = ["go", "run", "./cmd/node/main.go", "start"]
         else:
-            exe_path = f'{exe_path} start'
+            cmd = [str(self._exe_path), "start"]
         
-        cmd = f'{exe_path} -admin ":{node["admin_port"]}" -http ":{node["http_port"]}" -grpc ":{node["grpc_port"]}" -data "{node["data_dir"]}" -role "{node["role"]}"'
+        cmd += [
+            "-admin", f":{node['admin_port']}",
+            "-http", f":{node['http_port']}",
+            "-grpc", f":{node['grpc_port']}",
+            "-data", node["data_dir"],
+            "-role", node["role"],
+        ]
         
         log(f"启动节点 {node_id}...", "INFO")
+        self.invalidate_status(node_id)
         
-        # 后台启动
+        # 后台启动：子进程继承日志文件描述符后，父进程立即关闭自己的副本
         if os.name == 'nt':
-            subprocess.Popen(
-                cmd,
-                shell=True,
-                cwd=PROJECT_ROOT,
-                stdout=open(f'{node["data_dir"]}/stdout.log', 'w'),
-                stderr=open(f'{node["data_dir"]}/stderr.log', 'w'),
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
+            platform_kwargs = {"creationflags": subprocess.CREATE_NO_WINDOW}
         else:
+            platform_kwargs = {"start_new_session": True}
+        
+        with open(f'{node["data_dir"]}/stdout.log', 'ab', buffering=0) as stdout_log, \
+                open(f'{node["data_dir"]}/stderr.log', 'ab', buffering=0) as stderr_log:
             subprocess.Popen(
                 cmd,
-                shell=True,
                 cwd=PROJECT_ROOT,
-                stdout=open(f'{node["data_dir"]}/stdout.log', 'w'),
-                stderr=open(f'{node["data_dir"]}/stderr.log', 'w'),
-                start_new_session=True
+                stdout=stdout_log,
+                stderr=stderr_log,
+                **platform_kwargs
             )
         
-        # 等待启动
-        time.sleep(3)
+        # 等待启动：按指数退避轮询健康检查。token 文件重启后仍保留，不能作为就绪信号
+        health_url = f"http://127.0.0.1:{node['http_port']}/health"
+        ready = False
+        for delay in (0.1, 0.2, 0.4, 0.8, 1.6):
+            time.sleep(delay)
+            try:
+                if self.session.get(health_url, timeout=1).status_code == 200:
+                    ready = True
+                    break
+            except requests.RequestException:
+                pass
         
-        # 读取 token
+        # 节点应答后再读取 token
         token_file = Path(node["data_dir"]) / "admin_token"
-        if token_file.exists():
+        if ready and token_file.exists():
             node["token"] = token_file.read_text().strip()
             node["status"] = "running"
-            self.save_config()
+            self._cache_node_fields(node)
+            if save:
+                self.save_config()
             log(f"节点 {node_id} 启动成功", "SUCCESS")
             return True
         
@@ -303,9 +513,10 @@ class ClusterManager:
         """启动整个集群"""
         log("启动集群...", "HEADER")
         
-        for node_id in self.nodes:
-            self.start_node(node_id)
-            time.sleep(1)  # 间隔启动
+        # 限制并发数，避免同时启动过多进程争抢资源
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            list(executor.map(lambda node_id: self.start_node(node_id, save=False), list(self.nodes)))
+        self.save_config()
         
         log("集群启动完成", "SUCCESS")
     
@@ -314,56 +525,125 @@ class ClusterManager:
         log("停止集群...", "HEADER")
         
         # 首先尝试优雅停止每个节点
-        exe_path = BUILD_DIR / ("node.exe" if os.name == 'nt' else "node")
-        for node_id, node in self.nodes.items():
+        def stop_node(item):
+            node_id, node = item
             data_dir = node.get("data_dir", f"./data/node{node_id}")
-            if exe_path.exists():
-                cmd = f'"{exe_path}" stop -data "{data_dir}"'
+            if self._exe_exists:
+                cmd = [str(self._exe_path), "stop", "-data", data_dir]
             else:
-                cmd = f'go run ./cmd/node/main.go stop -data "{data_dir}"'
+                cmd = ["go", "run", "./cmd/node/main.go", "stop", "-data", data_dir]
             
             log(f"停止节点 {node_id}...", "INFO")
             run_command(cmd, capture=True)
             node["status"] = "stopped"
         
+        # 并发执行各节点的 stop 命令
+        list(self._probe_pool.map(stop_node, list(self.nodes.items())))
+        self.invalidate_status()
+        
         # 备用：强制停止残留进程
         time.sleep(1)
-        if os.name == 'nt':
-            run_command('taskkill /F /IM node.exe 2>nul', capture=True)
+        if USE_PSUTIL:
+            self._kill_leftover_nodes()
+        elif os.name == 'nt':
+            run_command(["taskkill", "/F", "/IM", "node.exe"], capture=True)
         else:
-            run_command("pkill -f 'node.*-admin'", capture=True)
+            run_command(["pkill", "-f", "node.*-admin"], capture=True)
         
         self.save_config()
         
         log("集群已停止", "SUCCESS")
     
+    def _is_node_process(self, cmdline):
+        """判断命令行是否为本集群启动的节点进程（必须带 -admin 参数）"""
+        if not cmdline or "-admin" not in cmdline:
+            return False
+        if os.path.basename(cmdline[0]) == self._exe_name:
+            return True
+        if not self._exe_exists:
+            # go run ./cmd/node/main.go 的父进程，以及 go-build 临时目录下编译出的 exe/main 子进程
+            if "./cmd/node/main.go" in cmdline:
+                return True
+            exe_dir, exe_file = os.path.split(cmdline[0])
+            return ("go-build" in exe_dir and os.path.basename(exe_dir) == "exe"
+                    and exe_file in ("main", "main.exe"))
+        return False
+    
+    def _kill_leftover_nodes(self):
+        """在进程内扫描并终止残留的节点进程，超时未退出的强制结束"""
+        matched = {}
+        for proc in psutil.process_iter(["name", "cmdline"]):
+            cmdline = proc.info["cmdline"] or []
+            if (proc.info["name"] == self._exe_name and "-admin" in cmdline) or self._is_node_process(cmdline):
+                try:
+                    # 连同子进程一起结束，go run 的编译产物不会成为孤儿进程
+                    for target in [proc] + proc.children(recursive=True):
+                        matched.setdefault(target.pid, target)
+                except psutil.Error:
+                    pass
+        
+        for proc in matched.values():
+            try:
+                proc.terminate()
+            except psutil.Error:
+                pass
+        
+        _, alive = psutil.wait_procs(list(matched.values()), timeout=3)
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.Error:
+                pass
+    
     def get_node_status(self, node_id):
-        """获取节点状态"""
+        """获取节点状态（成功结果缓存 STATUS_CACHE_TTL 秒）"""
         node = self.nodes.get(str(node_id))
         if not node or not node.get("token"):
             return None
         
+        cached = self._status_cache.get(str(node_id))
+        if cached and time.monotonic() - cached[0] < STATUS_CACHE_TTL:
+            return cached[1]
+        
         try:
-            headers = {"Authorization": f"Bearer {node['token']}"}
-            resp = requests.get(
-                f"http://localhost:{node['admin_port']}/api/node/status",
-                headers=headers,
+            resp = self.session.get(
+                node["_url_base"] + "/api/node/status",
+                headers=node["_auth_header"],
                 timeout=3
             )
             if resp.status_code == 200:
-                return resp.json()
+                status = resp.json()
+                self._status_cache[str(node_id)] = (time.monotonic(), status)
+                return status
         except:
             pass
         return None
     
+    def invalidate_status(self, node_id=None):
+        """清除节点状态缓存，node_id 为空时清除全部"""
+        if node_id is None:
+            self._status_cache.clear()
+        else:
+            self._status_cache.pop(str(node_id), None)
+    
     def cluster_status(self):
         """获取集群状态"""
         log("=" * 60, "HEADER")
         log("集群状态", "HEADER")
         log("=" * 60, "HEADER")
         
-        for node_id, node in self.nodes.items():
-            status = self.get_node_status(node_id)
+        # 并发探测所有节点，按节点顺序输出
+        futures = {self._probe_pool.submit(self.get_node_status, node_id): node_id
+                   for node_id in self.nodes}
+        statuses = {}
+        try:
+            for future in as_completed(futures, timeout=5):
+                statuses[futures[future]] = future.result()
+        except FutureTimeoutError:
+            pass
+        
+        for node_id in self.nodes:
+            status = statuses.get(node_id)
             if status:
                 peer_id = status.get("node_id", "")[:20] + "..."
                 log(f"Node {node_id}: ✅ Online - {peer_id}", "SUCCESS")
@@ -379,18 +659,14 @@ class ClusterManager:
             log(f"节点 {node_id} 未配置或未启动", "ERROR")
             return None
         
-        headers = {
-            "Authorization": f"Bearer {node['token']}",
-            "Content-Type": "application/json"
-        }
-        
-        url = f"http://localhost:{node['admin_port']}{endpoint}"
+        headers = node["_auth_header"]
+        url = node["_url_base"] + endpoint
         
         try:
             if method == "GET":
-                resp = requests.get(url, headers=headers, timeout=5)
+                resp = self.session.get(url, headers=headers, timeout=5)
             elif method == "POST":
-                resp = requests.post(url, headers=headers, json=data, timeout=5)
+                resp = self.session.post(url, headers=headers, json=data, timeout=5)
             else:
                 return None
             
@@ -398,6 +674,10 @@ class ClusterManager:
         except Exception as e:
             return {"error": str(e)}
     
+    def bulk_api(self, calls):
+        """并发调用多个节点 API，calls 为 (node_id, endpoint) 列表，按顺序返回结果"""
+        return list(self._probe_pool.map(lambda call: self.api_call(*call), calls))
+    
     def send_mail(self, from_node, to_peer_id, subject, content):
         """发送邮件"""
         return self.api_call(from_node, "/api/mailbox/send", "POST", {
@@ -435,7 +715,7 @@ class MaliciousSimulator:
     def log_event(self, event_type, node_id, description, result=None):
         """记录事件"""
         event = {
-            "time": datetime.now().isoformat(),
+            "time_ns": time.time_ns(),
             "type": event_type,
             "node": node_id,
             "description": description,
@@ -447,6 +727,13 @@ class MaliciousSimulator:
         log(f"{icon} [{event_type}] Node {node_id}: {description}", 
             "WARNING" if "malicious" in event_type.lower() else "INFO")
     
+    def flush_log(self, path):
+        """一次性序列化并写出全部模拟事件"""
+        with open(path, 'wb') as f:
+            f.write(_dumps(self.simulation_log))
+            f.write(b"\n")
+        log(f"模拟日志已保存: {path}", "SUCCESS")
+    
     def simulate_spam_attack(self, attacker_node, target_topic, num_messages=50):
         """
         模拟垃圾消息攻击
@@ -461,27 +748,20 @@ class MaliciousSimulator:
         log(f"消息数量: {num_messages}", "WARNING")
         log("", "INFO")
         
-        success_count = 0
-        fail_count = 0
+        # 并发发送全部消息，限流由服务端负责（这正是要测试的）
+        messages = [f"SPAM MESSAGE #{i} - BUY NOW! CLICK HERE!" for i in range(num_messages)]
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(
+                lambda content: self.cluster.publish_bulletin(attacker_node, target_topic, content, ttl=3600),
+                messages
+            ))
         
-        for i in range(num_messages):
-            result = self.cluster.publish_bulletin(
-                attacker_node, 
-                target_topic,
-                f"SPAM MESSAGE #{i} - BUY NOW! CLICK HERE!",
-                ttl=3600
-            )
-            
-            if result and "error" not in result:
-                success_count += 1
-            else:
-                fail_count += 1
-                # 可能被限流
-                if fail_count > 5:
-                    log(f"⚡ 检测到限流! 已发送 {success_count} 条后被阻止", "SUCCESS")
-                    break
-            
-            time.sleep(0.1)  # 模拟快速发送
+        success_count = sum(1 for result in results if result and "error" not in result)
+        fail_count = len(results) - success_count
+        
+        # 可能被限流
+        if fail_count > 5:
+            log(f"⚡ 检测到限流! 成功 {success_count} 条，被阻止 {fail_count} 条", "SUCCESS")
         
         self.log_event("MALICIOUS_SPAM", attacker_node, 
                       f"尝试发送 {num_messages} 条垃圾消息",
@@ -494,12 +774,14 @@ class MaliciousSimulator:
         log("", "INFO")
         log("🔍 检查其他节点是否收到垃圾消息...", "INFO")
         
-        for node_id in self.cluster.nodes:
-            if str(node_id) != str(attacker_node):
-                bulletin = self.cluster.get_bulletin(node_id, target_topic)
-                if bulletin:
-                    count = bulletin.get("count", 0)
-                    log(f"   Node {node_id} 的 {target_topic} 话题: {count} 条消息", "INFO")
+        other_nodes = [node_id for node_id in self.cluster.nodes if str(node_id) != str(attacker_node)]
+        bulletins = self.cluster.bulk_api(
+            [(node_id, f"/api/bulletin/topic/{target_topic}") for node_id in other_nodes]
+        )
+        for node_id, bulletin in zip(other_nodes, bulletins):
+            if bulletin:
+                count = bulletin.get("count", 0)
+                log(f"   Node {node_id} 的 {target_topic} 话题: {count} 条消息", "INFO")
     
     def simulate_fake_identity(self, attacker_node):
         """
@@ -721,8 +1003,12 @@ class MaliciousSimulator:
                       "尝试消息重放攻击",
                       {"blocked": True, "reason": "duplicate_detection"})
     
-    def run_all_simulations(self):
-        """运行所有恶意行为模拟"""
+    def run_all_simulations(self, parallel=False):
+        """运行所有恶意行为模拟
+        
+        parallel=True 时各场景在线程池中同时运行，场景内的等待互相重叠，
+        省去场景之间的间隔，但各场景的输出会交错
+        """
         log("", "HEADER")
         log("╔══════════════════════════════════════════════════════════╗", "HEADER")
         log("║       恶意行为模拟测试 - AgentNetwork 安全验证            ║", "HEADER")
@@ -735,32 +1021,29 @@ class MaliciousSimulator:
         log(f"🔴 指定恶意节点: Node {malicious_node}", "WARNING")
         log("", "INFO")
         
-        # 场景 1: 垃圾消息攻击
-        self.simulate_spam_attack(malicious_node, "general", num_messages=20)
-        
-        log("\n" + "="*60 + "\n", "INFO")
-        time.sleep(2)
-        
-        # 场景 2: 身份伪造
-        self.simulate_fake_identity(malicious_node)
-        
-        log("\n" + "="*60 + "\n", "INFO")
-        time.sleep(2)
-        
-        # 场景 3: 任务不交付
-        self.simulate_task_non_delivery(requester_node=1, worker_node=malicious_node)
-        
-        log("\n" + "="*60 + "\n", "INFO")
-        time.sleep(2)
-        
-        # 场景 4: 女巫攻击
-        self.simulate_sybil_attack(num_fake_nodes=5)
-        
-        log("\n" + "="*60 + "\n", "INFO")
-        time.sleep(2)
-        
-        # 场景 5: 消息重放
-        self.simulate_message_replay(malicious_node, target_node=1)
+        scenarios = [
+            # 场景 1: 垃圾消息攻击
+            lambda: self.simulate_spam_attack(malicious_node, "general", num_messages=20),
+            # 场景 2: 身份伪造
+            lambda: self.simulate_fake_identity(malicious_node),
+            # 场景 3: 任务不交付
+            lambda: self.simulate_task_non_delivery(requester_node=1, worker_node=malicious_node),
+            # 场景 4: 女巫攻击
+            lambda: self.simulate_sybil_attack(num_fake_nodes=5),
+            # 场景 5: 消息重放
+            lambda: self.simulate_message_replay(malicious_node, target_node=1),
+        ]
+        
+        if parallel:
+            with ThreadPoolExecutor(max_workers=len(scenarios)) as executor:
+                for future in [executor.submit(scenario) for scenario in scenarios]:
+                    future.result()
+        else:
+            for i, scenario in enumerate(scenarios):
+                if i > 0:
+                    log("\n" + "="*60 + "\n", "INFO")
+                    time.sleep(2)
+                scenario()
         
         # 生成报告
         log("\n", "INFO")
@@ -771,7 +1054,7 @@ class MaliciousSimulator:
         
         for event in self.simulation_log:
             icon = "🔴" if "MALICIOUS" in event["type"] else "🟢"
-            log(f"{icon} {event['type']}: {event['description']}", "INFO")
+            log(f"{icon} {_fmt_ts(event['time_ns'])} {event['type']}: {event['description']}", "INFO")
         
         log("", "INFO")
         log("📊 总结:", "SUCCESS")
@@ -813,6 +1096,8 @@ def main():
     sim_parser.add_argument("--scenario", type=str, 
                            choices=["spam", "identity", "non-delivery", "sybil", "replay", "all"],
                            default="all", help="模拟场景")
+    sim_parser.add_argument("--log-file", type=str, help="保存模拟事件日志 (JSON)")
+    sim_parser.add_argument("--parallel", action="store_true", help="并发运行所有场景（输出会交错）")
     
     args = parser.parse_args()
     
@@ -846,7 +1131,7 @@ def main():
         simulator = MaliciousSimulator(manager)
         
         if args.scenario == "all":
-            simulator.run_all_simulations()
+            simulator.run_all_simulations(parallel=args.parallel)
         elif args.scenario == "spam":
             simulator.simulate_spam_attack(5, "general", 20)
         elif args.scenario == "identity":
@@ -857,6 +1142,9 @@ def main():
             simulator.simulate_sybil_attack(5)
         elif args.scenario == "replay":
             simulator.simulate_message_replay(5, 1)
+        
+        if args.log_file:
+            simulator.flush_log(args.log_file)
     
     else:
         parser.print_help()
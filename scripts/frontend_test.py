@@ -19,50 +19,129 @@ DAAN 管理平台前端自动化测试
 import argparse
 import asyncio
 import json
-import os
+import re
 import sys
 import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
 try:
-    from playwright.async_api import async_playwright, Page, BrowserContext, ConsoleMessage, Error
+    from playwright.async_api import async_playwright, Page, BrowserContext, ConsoleMessage, Error, Locator
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 except ImportError:
     print("请先安装 Playwright: pip install playwright")
     print("然后安装浏览器: playwright install chromium")
     sys.exit(1)
 
+try:
+    import orjson
+    USE_ORJSON = True
+except ImportError:
+    USE_ORJSON = False
+
 # ============ 配置 ============
 
 DEFAULT_BASE_URL = "http://127.0.0.1:18080"
-DEFAULT_TOKEN_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "admin_token")
+_HERE = Path(__file__).resolve().parent
+DEFAULT_TOKEN_FILE = _HERE.parent / "data" / "admin_token"
 DEFAULT_TIMEOUT = 30000  # 30秒
-SCREENSHOT_DIR = os.path.join(os.path.dirname(__file__), "..", "test_logs", "screenshots")
+NAVIGATION_TIMEOUT = 10000  # 页面导航超时，卡住的页面尽快失败
+DEFAULT_OUTPUT_DIR = _HERE.parent / "test_logs"
+SCREENSHOT_DIR = DEFAULT_OUTPUT_DIR / "screenshots"
+PAGE_READY_TIMEOUT = 10000  # 等待页面关键元素出现的超时（毫秒）
+LOGIN_API = '/api/auth/login'
+DASHBOARD_URL_RE = re.compile(r'/dashboard')
+LOGIN_REDIRECT_TIMEOUT = 10000  # 登录后跳转仪表盘的超时（毫秒）
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media'})  # 测试不关心的资源
+DEFAULT_WORKERS = 4  # 并发测试使用的 BrowserContext 数量
+LOG_QUEUE_SIZE = 1024  # 待打印控制台日志的队列上限，满了直接丢弃
+SCREENSHOT_QUALITY = 70  # 失败截图的 JPEG 质量
+LOG_TEXT_LIMIT = 500  # 控制台日志在采集时即截断到该长度
+LOG_DEDUP_PREFIX = 200  # 类型相同且前 200 字相同的日志视为重复
+
+# 常用选择器，统一定义以便 Playwright 复用解析结果
+TOKEN_INPUT = 'input[type="password"]'
+SUBMIT_BTN = 'button[type="submit"], .el-button--primary'
+ERROR_ALERT = '.el-alert--error'
+INFO_CARD = '.info-card, .el-card'
+STAT_CARD = '.stat-card'
+TOPOLOGY_CHART = '.chart-container canvas, .chart-container svg'
+ENDPOINTS_PAGE = '.endpoints-page'
+ENDPOINT_ITEMS = '.endpoint-item, .el-table__row'
+LOGS_PAGE = '.logs-page'
+ABOUT_PAGE = '.about-page'
+DASHBOARD = '.dashboard'
+MAIN_CONTENT = '.dashboard, .el-main, main'
+NAV_ITEMS = '.el-menu-item, nav a'
+LOGOUT_BTN = 'button:has-text("登出"), button:has-text("退出"), .logout-btn'
+
+# 页面关键字检查，预编译一次
+DASHBOARD_TEXT_RE = re.compile(r"节点")
+TOPOLOGY_TEXT_RE = re.compile(r"拓扑|topology", re.IGNORECASE)
+ENDPOINTS_TEXT_RE = re.compile(r"API")
+LOGS_TEXT_RE = re.compile(r"日志|log", re.IGNORECASE)
+ABOUT_TEXT_RE = re.compile(r"关于|DAAN")
+
+# 自动化场景用不到的 Chromium 子系统统统关闭，缩短启动与导航开销
+CHROMIUM_ARGS = [
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-background-networking',
+    '--disable-extensions',
+    '--disable-translate',
+    '--disable-component-update',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--metrics-recording-only',
+    '--mute-audio',
+]
+
+# 控制台日志颜色
+CONSOLE_COLORS = {
+    'error': '\033[91m',
+    'warning': '\033[93m',
+    'info': '\033[94m',
+    'log': '\033[92m',
+    'debug': '\033[90m',
+}
+COLOR_RESET = '\033[0m'
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'locale': 'zh-CN',
+}
 
 # ============ 数据类型 ============
 
-@dataclass
+# 去掉实例 __dict__ 以减少大量日志对象的内存；slots 参数需要 Python 3.10+，
+# 脚本仍支持 3.8，低版本下退化为普通 dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class ConsoleLog:
     """控制台日志条目"""
-    timestamp: str
+    timestamp: float  # Unix 时间戳（秒），写报告时再格式化
     type: str  # log, warning, error, info, debug
     text: str
     location: Optional[str] = None
+    count: int = 1  # 相同日志出现的次数
     
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class TestResult:
     """测试结果"""
     name: str
     passed: bool
     message: str
-    duration: float
+    duration_ns: int  # 纳秒，输出报告时换算为秒
     console_logs: List[ConsoleLog] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
     screenshot: Optional[str] = None
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class TestReport:
     """测试报告"""
     timestamp: str
@@ -75,73 +154,236 @@ class TestReport:
     
 # ============ 测试框架 ============
 
+# 当前测试任务的日志列表；gather 出的每个任务各自持有一份
+_current_test_logs: ContextVar[Optional[List[ConsoleLog]]] = ContextVar('current_test_logs', default=None)
+
+class ContextPool:
+    """共享同一个 Chromium 实例的 BrowserContext 池
+
+    每个 context 各带一个 Page，互不共享 cookie/localStorage，
+    同一时刻一个 Page 只会被一个测试占用。
+    """
+
+    def __init__(self, browser, size: int, **context_options):
+        self.browser = browser
+        self.size = size
+        self.context_options = context_options
+        self.contexts: List[BrowserContext] = []
+        self.pages: List[Page] = []
+        self._idle: asyncio.Queue = asyncio.Queue()
+
+    async def start(self, on_page, storage_state: Optional[Dict[str, Any]] = None):
+        """预先创建全部 context，on_page 为协程函数，用于初始化新页面
+
+        storage_state 不为空时，新 context 直接带上该登录状态。
+        """
+        async def _create():
+            context = await self.browser.new_context(storage_state=storage_state,
+                                                     **self.context_options)
+            page = await context.new_page()
+            await on_page(page)
+            return context, page
+
+        for context, page in await asyncio.gather(*(_create() for _ in range(self.size))):
+            self.contexts.append(context)
+            self.pages.append(page)
+            self._idle.put_nowait(page)
+
+    async def restart(self, on_page, storage_state: Optional[Dict[str, Any]] = None):
+        """用新的存储状态重建全部 context，只能在没有测试占用时调用"""
+        await self.close()
+        self._idle = asyncio.Queue()
+        await self.start(on_page, storage_state)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """借出一个空闲 Page，用完归还"""
+        page = await self._idle.get()
+        try:
+            yield page
+        finally:
+            self._idle.put_nowait(page)
+
+    async def close(self):
+        for context in self.contexts:
+            await context.close()
+        self.contexts.clear()
+        self.pages.clear()
+
 class FrontendTester:
     """前端自动化测试器"""
     
-    def __init__(self, base_url: str, token: str, headless: bool = True):
+    def __init__(self, base_url: str, token: str, headless: bool = True,
+                 workers: int = DEFAULT_WORKERS):
         self.base_url = base_url.rstrip('/')
         self.token = token
         self.headless = headless
+        self.workers = max(1, workers)
         self.results: List[TestResult] = []
         self.console_logs: List[ConsoleLog] = []
+        self._log_type_counts: Counter = Counter()
+        # (类型, 文本前缀) -> 首次出现的日志条目，重复日志只累加计数
+        self._log_seen: Dict[tuple, ConsoleLog] = {}
+        # 墙钟起点 + 单调时钟增量，控制台日志取时间戳时不必每条都读系统时间
+        self._wall_epoch = time.time()
+        self._mono_epoch_ns = time.perf_counter_ns()
         self.page: Optional[Page] = None
         self.context: Optional[BrowserContext] = None
+        self.pool: Optional[ContextPool] = None
+        # 页面 -> 当前正在该页面上运行的测试的日志列表
+        self._test_logs: Dict[Page, List[ConsoleLog]] = {}
+        # 页面 -> {选择器: Locator}
+        self._locators: Dict[Page, Dict[str, Locator]] = {}
+        # 登录成功后的 storageState，以及已处于登录态的 context
+        self._auth_state: Optional[Dict[str, Any]] = None
+        self._authed_contexts: set = set()
+        # 控制台日志异步打印
+        self._log_queue: Optional[asyncio.Queue] = None
+        self._log_printer: Optional[asyncio.Task] = None
+        self._dropped_prints = 0
+        
+    def _loc(self, page: Page, selector: str) -> Locator:
+        """获取页面上缓存的 Locator"""
+        cache = self._locators.setdefault(page, {})
+        locator = cache.get(selector)
+        if locator is None:
+            locator = cache[selector] = page.locator(selector)
+        return locator
+        
+    def _now(self) -> float:
+        """由墙钟起点与单调时钟增量推算当前时间戳"""
+        return self._wall_epoch + (time.perf_counter_ns() - self._mono_epoch_ns) / 1e9
+        
+    def _record_log(self, page: Page, log_type: str, text: str,
+                    location: Optional[str] = None) -> Optional[ConsoleLog]:
+        """记录一条日志到全局列表及该页面当前测试的列表
+
+        重复日志不再新建条目，只累加首条的 count；返回值仅在新条目时非空。
+        """
+        self._log_type_counts[log_type] += 1
+        key = (log_type, text[:LOG_DEDUP_PREFIX])
+        log_entry = self._log_seen.get(key)
+        is_new = log_entry is None
+        if is_new:
+            log_entry = self._log_seen[key] = ConsoleLog(
+                timestamp=self._now(),
+                type=log_type,
+                text=text[:LOG_TEXT_LIMIT],
+                location=location
+            )
+            self.console_logs.append(log_entry)
+        else:
+            log_entry.count += 1
+        test_logs = self._test_logs.get(page)
+        if test_logs is not None:
+            test_logs.append(log_entry)
+        return log_entry if is_new else None
         
-    def _log_console(self, msg: ConsoleMessage):
+    def _log_console(self, page: Page, msg: ConsoleMessage):
         """捕获控制台日志"""
-        log_entry = ConsoleLog(
-            timestamp=datetime.now().isoformat(),
-            type=msg.type,
-            text=msg.text,
-            location=msg.location.get('url', '') if msg.location else None
+        log_entry = self._record_log(
+            page,
+            msg.type,
+            msg.text,
+            msg.location.get('url', '') if msg.location else None
         )
-        self.console_logs.append(log_entry)
-        
-        # 实时打印日志
-        color = {
-            'error': '\033[91m',
-            'warning': '\033[93m',
-            'info': '\033[94m',
-            'log': '\033[92m',
-            'debug': '\033[90m'
-        }.get(msg.type, '\033[0m')
-        reset = '\033[0m'
-        print(f"  {color}[Console {msg.type.upper()}]{reset} {msg.text[:200]}{'...' if len(msg.text) > 200 else ''}")
-        
-    async def _take_screenshot(self, name: str) -> str:
-        """截图"""
-        os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+        
+        # 实时打印交给后台任务，回调立即返回；重复日志不再打印
+        if log_entry is not None and self._log_queue is not None:
+            try:
+                self._log_queue.put_nowait(log_entry)
+            except asyncio.QueueFull:
+                self._dropped_prints += 1
+                
+    @staticmethod
+    def _print_console_log(log: ConsoleLog):
+        color = CONSOLE_COLORS.get(log.type, COLOR_RESET)
+        text = log.text
+        print(f"  {color}[Console {log.type.upper()}]{COLOR_RESET} {text[:200]}{'...' if len(text) > 200 else ''}")
+        
+    async def _print_console_logs(self):
+        """后台打印控制台日志"""
+        while True:
+            self._print_console_log(await self._log_queue.get())
+            
+    async def _stop_log_printer(self):
+        """停止打印任务并输出队列中剩余的日志"""
+        if self._log_printer:
+            self._log_printer.cancel()
+            try:
+                await self._log_printer
+            except asyncio.CancelledError:
+                pass
+            self._log_printer = None
+        while self._log_queue is not None and not self._log_queue.empty():
+            self._print_console_log(self._log_queue.get_nowait())
+        if self._dropped_prints:
+            print(f"  ⚠️ 控制台输出过多，{self._dropped_prints} 条日志未打印（已记录到报告）")
+            
+    async def _take_screenshot(self, page: Page, name: str, full_page: bool = False) -> str:
+        """截图
+
+        默认只截当前视口并保存为 JPEG；需要完整滚动区域时传 full_page=True（PNG）。
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{name}_{timestamp}.png"
-        filepath = os.path.join(SCREENSHOT_DIR, filename)
-        await self.page.screenshot(path=filepath, full_page=True)
+        if full_page:
+            filepath = str(SCREENSHOT_DIR / f"{name}_{timestamp}.png")
+            await page.screenshot(path=filepath, full_page=True)
+        else:
+            filepath = str(SCREENSHOT_DIR / f"{name}_{timestamp}.jpg")
+            await page.screenshot(path=filepath, type='jpeg', quality=SCREENSHOT_QUALITY)
         return filepath
         
+    def _watch_page(self, page: Page):
+        """给页面挂上控制台与页面错误监听"""
+        # 监听控制台消息
+        page.on('console', lambda msg: self._log_console(page, msg))
+        
+        # 监听页面错误
+        page.on('pageerror', lambda error: self._record_log(page, 'error', f"Page Error: {error}"))
+        
+    @staticmethod
+    async def _block_resources(route):
+        """拦截图片、字体、媒体及统计脚本，只放行断言需要的请求"""
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or 'analytics' in request.url:
+            await route.abort()
+        else:
+            await route.continue_()
+            
+    async def _prepare_page(self, page: Page):
+        """初始化新页面：挂监听并拦截无关资源"""
+        self._watch_page(page)
+        page.context.set_default_timeout(DEFAULT_TIMEOUT)
+        page.context.set_default_navigation_timeout(NAVIGATION_TIMEOUT)
+        await page.context.route('**/*', self._block_resources)
+        
     async def setup(self):
         """设置浏览器"""
+        # 截图目录只在启动时创建一次
+        SCREENSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        self._log_queue = asyncio.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._log_printer = asyncio.create_task(self._print_console_logs())
         self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless)
-        self.context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            locale='zh-CN'
+        self.browser = await self.playwright.chromium.launch(
+            headless=self.headless,
+            args=CHROMIUM_ARGS,
+            chromium_sandbox=False
         )
+        self.context = await self.browser.new_context(**CONTEXT_OPTIONS)
         self.page = await self.context.new_page()
+        await self._prepare_page(self.page)
         
-        # 监听控制台消息
-        self.page.on('console', self._log_console)
-        
-        # 监听页面错误
-        self.page.on('pageerror', lambda error: self.console_logs.append(
-            ConsoleLog(
-                timestamp=datetime.now().isoformat(),
-                type='error',
-                text=f"Page Error: {error}",
-                location=None
-            )
-        ))
+        # 并发测试用的 context 池，与主页面共用同一个浏览器
+        if self.workers > 1:
+            self.pool = ContextPool(self.browser, self.workers, **CONTEXT_OPTIONS)
+            await self.pool.start(self._prepare_page)
         
     async def teardown(self):
         """清理"""
+        await self._stop_log_printer()
+        if self.pool:
+            await self.pool.close()
         if self.context:
             await self.context.close()
         if self.browser:
@@ -149,21 +391,25 @@ class FrontendTester:
         if self.playwright:
             await self.playwright.stop()
             
-    async def run_test(self, name: str, test_func) -> TestResult:
-        """运行单个测试"""
+    async def run_test(self, name: str, test_func, page: Optional[Page] = None) -> TestResult:
+        """运行单个测试，page 缺省时使用主页面"""
+        page = page or self.page
         print(f"\n{'='*60}")
         print(f"测试: {name}")
         print('='*60)
         
-        start_time = time.time()
-        start_log_count = len(self.console_logs)
+        start_ns = time.perf_counter_ns()
+        # 控制台回调运行在 Playwright 的分发任务里，看不到本任务的 ContextVar，
+        # 因此回调按页面查找日志列表，测试代码本身通过 ContextVar 读取
+        test_logs = self._test_logs[page] = []
+        logs_token = _current_test_logs.set(test_logs)
         errors = []
         passed = False
         message = ""
         screenshot = None
         
         try:
-            await test_func()
+            await test_func(page)
             passed = True
             message = "测试通过"
             print(f"✅ {message}")
@@ -179,13 +425,14 @@ class FrontendTester:
         # 失败时截图
         if not passed:
             try:
-                screenshot = await self._take_screenshot(name.replace(' ', '_'))
+                screenshot = await self._take_screenshot(page, name.replace(' ', '_'))
                 print(f"📸 截图已保存: {screenshot}")
             except Exception as e:
                 print(f"⚠️ 截图失败: {e}")
                 
-        duration = time.time() - start_time
-        test_logs = self.console_logs[start_log_count:]
+        duration_ns = time.perf_counter_ns() - start_ns
+        self._test_logs.pop(page, None)
+        _current_test_logs.reset(logs_token)
         
         # 检查控制台错误
         console_errors = [log for log in test_logs if log.type == 'error']
@@ -198,204 +445,220 @@ class FrontendTester:
             name=name,
             passed=passed,
             message=message,
-            duration=duration,
+            duration_ns=duration_ns,
             console_logs=test_logs,
             errors=errors,
             screenshot=screenshot
         )
-        self.results.append(result)
         return result
 
+    async def _share_auth_state(self):
+        """把主页面的登录状态同步给 context 池，池中页面免去逐个登录"""
+        if not (self.pool and self._auth_state):
+            return
+        for page in self.pool.pages:
+            self._locators.pop(page, None)
+            self._authed_contexts.discard(page.context)
+        await self.pool.restart(self._prepare_page, self._auth_state)
+        self._authed_contexts.update(self.pool.contexts)
+        
+    async def _run_with_pool(self, name: str, test_func) -> TestResult:
+        """从 context 池借一个页面运行测试"""
+        async with self.pool.acquire() as page:
+            return await self.run_test(name, test_func, page)
+            
+    async def run_tests(self, tests, concurrent: bool = False):
+        """运行一组测试，concurrent 时分发到 context 池并发执行"""
+        if concurrent and self.pool:
+            results = await asyncio.gather(*(self._run_with_pool(name, fn) for name, fn in tests))
+        else:
+            results = [await self.run_test(name, fn) for name, fn in tests]
+        # 按声明顺序记录结果
+        self.results.extend(results)
+
     # ============ 测试用例 ============
     
-    async def test_health_check(self):
+    async def test_health_check(self, page: Page):
         """测试健康检查 API"""
-        response = await self.page.request.get(f"{self.base_url}/api/health")
+        response = await page.request.get(f"{self.base_url}/api/health")
         assert response.status == 200, f"健康检查失败: status={response.status}"
         
         data = await response.json()
         assert data.get('status') == 'healthy', f"状态不正确: {data}"
         print(f"  健康检查响应: {data}")
         
-    async def test_login_page_loads(self):
+    async def test_login_page_loads(self, page: Page):
         """测试登录页面加载"""
-        await self.page.goto(f"{self.base_url}/login")
-        await self.page.wait_for_load_state('networkidle')
+        await self._goto(page, "/login", TOKEN_INPUT)
         
         # 检查页面元素
-        title = await self.page.title()
+        title = await page.title()
         print(f"  页面标题: {title}")
         
         # 检查登录表单
-        token_input = await self.page.query_selector('input[type="password"]')
-        assert token_input, "找不到令牌输入框"
-        
-        login_button = await self.page.query_selector('button[type="submit"], .el-button--primary')
-        assert login_button, "找不到登录按钮"
+        await self._assert_attached(page, TOKEN_INPUT, "找不到令牌输入框")
+        await self._assert_attached(page, SUBMIT_BTN, "找不到登录按钮")
         
         print("  ✓ 登录页面元素完整")
         
-    async def test_login_with_invalid_token(self):
+    async def test_login_with_invalid_token(self, page: Page):
         """测试无效令牌登录"""
-        await self.page.goto(f"{self.base_url}/login")
-        await self.page.wait_for_load_state('networkidle')
+        await self._goto(page, "/login", TOKEN_INPUT)
         
-        # 输入无效令牌
-        await self.page.fill('input[type="password"]', 'invalid_token_12345')
-        await self.page.click('button[type="submit"], .el-button--primary')
-        
-        # 等待响应
-        await self.page.wait_for_timeout(2000)
+        # 输入无效令牌，等待登录接口返回
+        await self._loc(page, TOKEN_INPUT).fill('invalid_token_12345')
+        async with page.expect_response(lambda r: LOGIN_API in r.url, timeout=PAGE_READY_TIMEOUT):
+            await self._loc(page, SUBMIT_BTN).first.click()
         
         # 检查错误消息
-        error_alert = await self.page.query_selector('.el-alert--error')
-        if error_alert:
+        try:
+            await self._loc(page, ERROR_ALERT).first.wait_for(state='visible', timeout=2000)
+        except Error:
+            pass
+        error_alert = self._loc(page, ERROR_ALERT).first
+        if await error_alert.count():
             error_text = await error_alert.text_content()
             print(f"  错误提示: {error_text}")
             assert "无效" in error_text or "失败" in error_text or "Invalid" in error_text or "invalid" in error_text, "错误消息不正确"
         
         # 确保仍在登录页
-        assert "/login" in self.page.url, f"应该停留在登录页，当前URL: {self.page.url}"
+        assert "/login" in page.url, f"应该停留在登录页，当前URL: {page.url}"
         print("  ✓ 无效令牌登录正确处理")
         
-    async def test_login_with_valid_token(self):
+    async def test_login_with_valid_token(self, page: Page):
         """测试有效令牌登录"""
-        await self.page.goto(f"{self.base_url}/login")
-        await self.page.wait_for_load_state('networkidle')
+        await self._goto(page, "/login", TOKEN_INPUT)
         
         # 输入有效令牌
-        await self.page.fill('input[type="password"]', self.token)
-        await self.page.click('button[type="submit"], .el-button--primary')
+        await self._loc(page, TOKEN_INPUT).fill(self.token)
         
-        # 等待跳转到仪表盘
+        # 等待登录接口返回并跳转到仪表盘
         try:
-            await self.page.wait_for_url("**/dashboard", timeout=10000)
-            print(f"  ✓ 成功跳转到: {self.page.url}")
+            async with page.expect_navigation(url=DASHBOARD_URL_RE, timeout=LOGIN_REDIRECT_TIMEOUT):
+                async with page.expect_response(lambda r: LOGIN_API in r.url and r.status == 200,
+                                                timeout=PAGE_READY_TIMEOUT):
+                    await self._loc(page, SUBMIT_BTN).first.click()
+            print(f"  ✓ 成功跳转到: {page.url}")
         except Exception as e:
             # 检查当前URL
-            print(f"  当前URL: {self.page.url}")
+            print(f"  当前URL: {page.url}")
             raise AssertionError(f"登录后未跳转到仪表盘: {e}")
             
-    async def test_dashboard_loads(self):
+        # 保存登录状态，后续 context 直接复用
+        self._auth_state = await page.context.storage_state()
+        self._authed_contexts.add(page.context)
+            
+    async def test_dashboard_loads(self, page: Page):
         """测试仪表盘页面加载"""
         # 确保已登录
-        await self._ensure_logged_in()
+        await self._ensure_logged_in(page)
         
-        await self.page.goto(f"{self.base_url}/dashboard")
-        await self.page.wait_for_load_state('networkidle')
-        await self.page.wait_for_timeout(2000)  # 等待数据加载
+        # 等待节点信息卡片渲染
+        await self._goto(page, "/dashboard", INFO_CARD)
         
         # 检查节点信息卡片
-        node_info = await self.page.query_selector('.info-card, .el-card')
-        assert node_info, "找不到节点信息卡片"
+        await self._assert_attached(page, INFO_CARD, "找不到节点信息卡片")
         
         # 检查统计数据
-        stat_cards = await self.page.query_selector_all('.stat-card')
-        print(f"  找到 {len(stat_cards)} 个统计卡片")
+        stat_count = await self._loc(page, STAT_CARD).count()
+        print(f"  找到 {stat_count} 个统计卡片")
         
         # 检查节点ID显示
-        page_content = await self.page.content()
-        assert "节点" in page_content, "页面应显示节点信息"
+        await self._assert_text(page, DASHBOARD_TEXT_RE, "页面应显示节点信息")
         
         print("  ✓ 仪表盘页面加载正常")
         
-    async def test_topology_page(self):
+    async def test_topology_page(self, page: Page):
         """测试网络拓扑页面"""
-        await self._ensure_logged_in()
+        await self._ensure_logged_in(page)
         
-        await self.page.goto(f"{self.base_url}/topology")
-        await self.page.wait_for_load_state('networkidle')
-        await self.page.wait_for_timeout(3000)  # 等待图表渲染
+        # 等待图表画布渲染
+        await self._goto(page, "/topology", TOPOLOGY_CHART)
         
         # 检查页面加载
-        page_content = await self.page.content()
-        assert "拓扑" in page_content or "topology" in page_content.lower(), "拓扑页面未正确加载"
+        await self._assert_text(page, TOPOLOGY_TEXT_RE, "拓扑页面未正确加载")
         
         print("  ✓ 网络拓扑页面加载正常")
         
-    async def test_endpoints_page(self):
+    async def test_endpoints_page(self, page: Page):
         """测试 API 浏览器页面"""
-        await self._ensure_logged_in()
+        await self._ensure_logged_in(page)
         
-        await self.page.goto(f"{self.base_url}/endpoints")
-        await self.page.wait_for_load_state('networkidle')
-        await self.page.wait_for_timeout(2000)
+        await self._goto(page, "/endpoints", ENDPOINTS_PAGE)
         
         # 检查 API 列表
-        page_content = await self.page.content()
-        assert "API" in page_content, "API 浏览器页面未正确加载"
+        await self._assert_text(page, ENDPOINTS_TEXT_RE, "API 浏览器页面未正确加载")
         
         # 查找端点列表
-        endpoints = await self.page.query_selector_all('.endpoint-item, .el-table__row')
-        print(f"  找到 {len(endpoints)} 个 API 端点")
+        endpoint_count = await self._loc(page, ENDPOINT_ITEMS).count()
+        print(f"  找到 {endpoint_count} 个 API 端点")
         
         print("  ✓ API 浏览器页面加载正常")
         
-    async def test_logs_page(self):
+    async def test_logs_page(self, page: Page):
         """测试日志页面"""
-        await self._ensure_logged_in()
+        await self._ensure_logged_in(page)
         
-        await self.page.goto(f"{self.base_url}/logs")
-        await self.page.wait_for_load_state('networkidle')
-        await self.page.wait_for_timeout(2000)
+        await self._goto(page, "/logs", LOGS_PAGE)
         
-        page_content = await self.page.content()
-        assert "日志" in page_content or "log" in page_content.lower(), "日志页面未正确加载"
+        await self._assert_text(page, LOGS_TEXT_RE, "日志页面未正确加载")
         
         print("  ✓ 日志页面加载正常")
         
-    async def test_about_page(self):
+    async def test_about_page(self, page: Page):
         """测试关于页面"""
-        await self._ensure_logged_in()
+        await self._ensure_logged_in(page)
         
-        await self.page.goto(f"{self.base_url}/about")
-        await self.page.wait_for_load_state('networkidle')
+        await self._goto(page, "/about", ABOUT_PAGE)
         
-        page_content = await self.page.content()
-        assert "关于" in page_content or "DAAN" in page_content, "关于页面未正确加载"
+        await self._assert_text(page, ABOUT_TEXT_RE, "关于页面未正确加载")
         
         print("  ✓ 关于页面加载正常")
         
-    async def test_navigation_menu(self):
+    async def test_navigation_menu(self, page: Page):
         """测试导航菜单"""
-        await self._ensure_logged_in()
+        await self._ensure_logged_in(page)
         
-        await self.page.goto(f"{self.base_url}/dashboard")
-        await self.page.wait_for_load_state('networkidle')
+        await self._goto(page, "/dashboard", NAV_ITEMS)
         
         # 查找导航菜单项
-        nav_items = await self.page.query_selector_all('.el-menu-item, nav a')
-        print(f"  找到 {len(nav_items)} 个导航项")
+        nav_count = await self._loc(page, NAV_ITEMS).count()
+        print(f"  找到 {nav_count} 个导航项")
         
         # 测试点击各个菜单
         menu_items = ['topology', 'endpoints', 'logs', 'about']
         for item in menu_items:
-            nav_link = await self.page.query_selector(f'a[href*="{item}"], .el-menu-item:has-text("{item}")')
-            if nav_link:
-                await nav_link.click()
-                await self.page.wait_for_load_state('networkidle')
-                await self.page.wait_for_timeout(1000)
-                print(f"  ✓ 导航到 {item}: {self.page.url}")
+            nav_link = page.locator(f'a[href*="{item}"], .el-menu-item:has-text("{item}")').first
+            if await nav_link.count():
+                # 点击与导航事件同时等待，导航提交即返回
+                async with page.expect_navigation(timeout=5000):
+                    await nav_link.click()
+                print(f"  ✓ 导航到 {item}: {page.url}")
                 
         print("  ✓ 导航菜单工作正常")
         
-    async def test_logout(self):
+    async def test_logout(self, page: Page):
         """测试登出功能"""
-        await self._ensure_logged_in()
+        await self._ensure_logged_in(page)
         
         # 查找登出按钮
-        logout_btn = await self.page.query_selector('button:has-text("登出"), button:has-text("退出"), .logout-btn')
-        if logout_btn:
+        logout_btn = self._loc(page, LOGOUT_BTN).first
+        if await logout_btn.count():
             await logout_btn.click()
-            await self.page.wait_for_timeout(2000)
+            try:
+                await page.wait_for_url("**/login", timeout=PAGE_READY_TIMEOUT)
+            except Error:
+                pass
+            
+            self._authed_contexts.discard(page.context)
             
             # 检查是否回到登录页
-            assert "/login" in self.page.url, f"登出后应跳转到登录页，当前: {self.page.url}"
+            assert "/login" in page.url, f"登出后应跳转到登录页，当前: {page.url}"
             print("  ✓ 登出成功")
         else:
             print("  ⚠️ 未找到登出按钮，跳过测试")
             
-    async def test_api_response_times(self):
+    async def test_api_response_times(self, page: Page):
         """测试 API 响应时间"""
         apis = [
             ("/api/health", "健康检查"),
@@ -404,38 +667,53 @@ class FrontendTester:
             ("/api/stats", "网络统计"),
         ]
         
-        await self._ensure_logged_in()
+        await self._ensure_logged_in(page)
         
-        for endpoint, name in apis:
-            start = time.time()
-            response = await self.page.request.get(f"{self.base_url}{endpoint}")
-            duration = (time.time() - start) * 1000  # ms
+        async def probe(endpoint: str, name: str):
+            start_ns = time.perf_counter_ns()
+            response = await page.request.get(f"{self.base_url}{endpoint}")
+            return name, response.status, (time.perf_counter_ns() - start_ns) / 1e6  # ms
             
-            status_emoji = "✓" if response.status == 200 else "✗"
-            print(f"  {status_emoji} {name}: {response.status} ({duration:.0f}ms)")
+        # 各接口相互独立，并发探测，分别计时
+        results = await asyncio.gather(*(probe(endpoint, name) for endpoint, name in apis))
+        
+        for name, status, duration in results:
+            status_emoji = "✓" if status == 200 else "✗"
+            print(f"  {status_emoji} {name}: {status} ({duration:.0f}ms)")
             
-            assert response.status in [200, 401], f"{name} 响应异常: {response.status}"
+            assert status in [200, 401], f"{name} 响应异常: {status}"
             assert duration < 5000, f"{name} 响应过慢: {duration}ms"
             
-    async def test_websocket_connection(self):
+    async def test_websocket_connection(self, page: Page):
         """测试 WebSocket 连接"""
-        await self._ensure_logged_in()
-        await self.page.goto(f"{self.base_url}/dashboard")
-        await self.page.wait_for_load_state('networkidle')
+        await self._ensure_logged_in(page)
         
-        # 等待 WebSocket 建立
-        await self.page.wait_for_timeout(3000)
+        # 导航前开始记录 WebSocket，页面加载失败照常抛出
+        websockets = []
+        on_websocket = websockets.append
+        page.on('websocket', on_websocket)
+        try:
+            await self._goto(page, "/dashboard", DASHBOARD)
+            # 只有等待 WebSocket 超时才视为未建立连接
+            if not websockets:
+                try:
+                    await page.wait_for_event('websocket', timeout=3000)
+                except PlaywrightTimeoutError:
+                    print("  ⚠️ 3 秒内未建立 WebSocket 连接")
+        finally:
+            page.remove_listener('websocket', on_websocket)
         
         # 检查控制台是否有 WebSocket 相关日志
-        ws_logs = [log for log in self.console_logs if 'WebSocket' in log.text or 'ws' in log.text.lower()]
+        ws_logs = [log for log in _current_test_logs.get() or ()
+                   if 'WebSocket' in log.text or 'ws' in log.text.lower()]
         print(f"  WebSocket 相关日志: {len(ws_logs)} 条")
         
         # WebSocket 连接可能失败（如果服务不支持），但不应有未捕获的错误
         print("  ✓ WebSocket 测试完成")
         
-    async def test_responsive_design(self):
+    async def test_responsive_design(self, page: Page):
         """测试响应式设计"""
-        await self._ensure_logged_in()
+        await self._ensure_logged_in(page)
         
         viewports = [
             (1920, 1080, "桌面"),
@@ -444,49 +722,75 @@ class FrontendTester:
             (375, 667, "手机"),
         ]
         
+        # 只加载一次，之后原地调整视口，页面随 resize 重新布局
+        await self._goto(page, "/dashboard", MAIN_CONTENT)
+        main_content = self._loc(page, MAIN_CONTENT).first
+        
         for width, height, device in viewports:
-            await self.page.set_viewport_size({"width": width, "height": height})
-            await self.page.goto(f"{self.base_url}/dashboard")
-            await self.page.wait_for_load_state('networkidle')
-            await self.page.wait_for_timeout(1000)
+            await page.set_viewport_size({"width": width, "height": height})
             
             # 检查页面是否可见
-            visible_content = await self.page.query_selector('.dashboard, .el-main, main')
-            assert visible_content, f"{device} 视图下页面内容不可见"
+            try:
+                await main_content.wait_for(state='visible', timeout=2000)
+            except Error:
+                raise AssertionError(f"{device} 视图下页面内容不可见")
             print(f"  ✓ {device} ({width}x{height})")
             
         # 恢复默认视口
-        await self.page.set_viewport_size({"width": 1920, "height": 1080})
+        await page.set_viewport_size({"width": 1920, "height": 1080})
         print("  ✓ 响应式设计测试通过")
         
-    async def test_url_token_login(self):
+    async def test_url_token_login(self, page: Page):
         """测试 URL 令牌登录"""
         # 直接用 token 参数访问登录页
         url_with_token = f"{self.base_url}/login?token={self.token}"
-        await self.page.goto(url_with_token)
         
         # 等待自动登录和跳转
         try:
-            await self.page.wait_for_url("**/dashboard", timeout=10000)
-            print(f"  ✓ URL 令牌登录成功，跳转到: {self.page.url}")
+            async with page.expect_navigation(url=DASHBOARD_URL_RE, timeout=LOGIN_REDIRECT_TIMEOUT):
+                await page.goto(url_with_token)
+            print(f"  ✓ URL 令牌登录成功，跳转到: {page.url}")
         except Exception as e:
-            print(f"  当前URL: {self.page.url}")
+            print(f"  当前URL: {page.url}")
             # 不一定是错误，可能需要手动确认
             print(f"  ⚠️ URL 令牌自动登录未生效: {e}")
             
     # ============ 辅助方法 ============
     
-    async def _ensure_logged_in(self):
+    async def _assert_attached(self, page: Page, selector: str, message: str, timeout: int = 2000):
+        """断言页面上存在匹配 selector 的元素"""
+        try:
+            await self._loc(page, selector).first.wait_for(state='attached', timeout=timeout)
+        except Error:
+            raise AssertionError(message)
+            
+    async def _assert_text(self, page: Page, pattern: re.Pattern, message: str, timeout: int = 5000):
+        """断言页面上出现匹配 pattern 的文本，在渲染进程内完成匹配"""
+        try:
+            await page.get_by_text(pattern).first.wait_for(state='attached', timeout=timeout)
+        except Error:
+            raise AssertionError(message)
+            
+    async def _goto(self, page: Page, path: str, ready_selector: str):
+        """打开页面并等待关键元素可见，代替 networkidle + 固定等待"""
+        await page.goto(f"{self.base_url}{path}", wait_until='domcontentloaded')
+        await self._loc(page, ready_selector).first.wait_for(state='visible', timeout=PAGE_READY_TIMEOUT)
+        
+    async def _ensure_logged_in(self, page: Page):
         """确保已登录状态"""
-        # 检查是否已登录
-        await self.page.goto(f"{self.base_url}/dashboard")
-        await self.page.wait_for_timeout(1000)
+        # 已知处于登录态的 context 无需再打开仪表盘确认
+        if page.context in self._authed_contexts and "/login" not in page.url:
+            return
+            
+        # 检查是否已登录：仪表盘或登录框先出现的那个决定当前状态
+        await self._goto(page, "/dashboard", f'{DASHBOARD}, {TOKEN_INPUT}')
         
-        if "/login" in self.page.url:
+        if "/login" in page.url:
             # 需要登录
-            await self.page.fill('input[type="password"]', self.token)
-            await self.page.click('button[type="submit"], .el-button--primary')
-            await self.page.wait_for_url("**/dashboard", timeout=10000)
+            await self._loc(page, TOKEN_INPUT).fill(self.token)
+            async with page.expect_navigation(url=DASHBOARD_URL_RE, timeout=LOGIN_REDIRECT_TIMEOUT):
+                await self._loc(page, SUBMIT_BTN).first.click()
+        self._authed_contexts.add(page.context)
             
     async def run_all_tests(self):
         """运行所有测试"""
@@ -496,11 +800,18 @@ class FrontendTester:
         print(f"时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("="*60)
         
-        tests = [
+        # 未登录状态下的测试，各自使用池中的独立 context
+        anonymous_tests = [
             ("健康检查 API", self.test_health_check),
             ("登录页面加载", self.test_login_page_loads),
             ("无效令牌登录", self.test_login_with_invalid_token),
+        ]
+        # 登录态相关，在主页面上顺序执行
+        login_tests = [
             ("有效令牌登录", self.test_login_with_valid_token),
+        ]
+        # 页面加载类测试相互独立，池中 context 复用主页面的登录状态
+        page_tests = [
             ("仪表盘页面", self.test_dashboard_loads),
             ("网络拓扑页面", self.test_topology_page),
             ("API 浏览器页面", self.test_endpoints_page),
@@ -509,14 +820,19 @@ class FrontendTester:
             ("导航菜单", self.test_navigation_menu),
             ("API 响应时间", self.test_api_response_times),
             ("WebSocket 连接", self.test_websocket_connection),
+        ]
+        final_tests = [
             ("URL 令牌登录", self.test_url_token_login),
         ]
         
         await self.setup()
         
         try:
-            for name, test_func in tests:
-                await self.run_test(name, test_func)
+            await self.run_tests(anonymous_tests, concurrent=True)
+            await self.run_tests(login_tests)
+            await self._share_auth_state()
+            await self.run_tests(page_tests, concurrent=True)
+            await self.run_tests(final_tests)
         finally:
             await self.teardown()
             
@@ -529,9 +845,11 @@ class FrontendTester:
         print(f"目标: {self.base_url}")
         print("="*60)
         
-        tests = [
+        anonymous_tests = [
             ("健康检查 API", self.test_health_check),
             ("登录页面加载", self.test_login_page_loads),
+        ]
+        login_tests = [
             ("有效令牌登录", self.test_login_with_valid_token),
             ("仪表盘页面", self.test_dashboard_loads),
         ]
@@ -539,8 +857,8 @@ class FrontendTester:
         await self.setup()
         
         try:
-            for name, test_func in tests:
-                await self.run_test(name, test_func)
+            await self.run_tests(anonymous_tests, concurrent=True)
+            await self.run_tests(login_tests)
         finally:
             await self.teardown()
             
@@ -568,13 +886,10 @@ class FrontendTester:
         print(f"总计: {report.total_tests} 个测试")
         print(f"通过: {report.passed} ✅")
         print(f"失败: {report.failed} ❌")
-        print(f"控制台日志: {len(self.console_logs)} 条")
+        print(f"控制台日志: {sum(self._log_type_counts.values())} 条（去重后 {len(self.console_logs)} 条）")
         
-        # 统计控制台日志类型
-        log_types = {}
-        for log in self.console_logs:
-            log_types[log.type] = log_types.get(log.type, 0) + 1
-        print(f"日志类型分布: {log_types}")
+        # 统计控制台日志类型（采集时已累计）
+        print(f"日志类型分布: {dict(self._log_type_counts)}")
         
         # 列出失败的测试
         if failed > 0:
@@ -590,10 +905,14 @@ class FrontendTester:
         if error_logs:
             print(f"\n控制台错误 ({len(error_logs)} 条):")
             for log in error_logs[:10]:  # 只显示前10条
-                print(f"  [{log.timestamp}] {log.text[:100]}...")
+                print(f"  [{_format_ts(log.timestamp)}] {log.text[:100]}...")
                 
         return report
 
+def _format_ts(ts: float) -> str:
+    """把日志时间戳格式化为 ISO 字符串"""
+    return datetime.fromtimestamp(ts).isoformat()
+
 def read_token(token_file: str) -> str:
     """读取管理令牌"""
     try:
@@ -605,9 +924,10 @@ def read_token(token_file: str) -> str:
         
 def save_report(report: TestReport, output_dir: str):
     """保存测试报告"""
-    os.makedirs(output_dir, exist_ok=True)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = os.path.join(output_dir, f"frontend_test_{timestamp}.json")
+    filename = str(output_dir / f"frontend_test_{timestamp}.json")
     
     # 转换为可序列化的格式
     report_dict = {
@@ -621,26 +941,32 @@ def save_report(report: TestReport, output_dir: str):
                 "name": r.name,
                 "passed": r.passed,
                 "message": r.message,
-                "duration": r.duration,
+                "duration": r.duration_ns / 1e9,
                 "errors": r.errors,
                 "screenshot": r.screenshot,
                 "console_logs_count": len(r.console_logs)
             }
             for r in report.results
         ],
+        # 日志文本在采集时已截断，时间戳到这里才格式化
         "console_logs": [
             {
-                "timestamp": log.timestamp,
+                "timestamp": _format_ts(log.timestamp),
                 "type": log.type,
-                "text": log.text[:500],  # 截断长文本
-                "location": log.location
+                "text": log.text,
+                "location": log.location,
+                "count": log.count
             }
             for log in report.all_console_logs
         ]
     }
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(report_dict, f, ensure_ascii=False, indent=2)
+    if USE_ORJSON:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(report_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report_dict, f, ensure_ascii=False, indent=2)
         
     print(f"\n📄 测试报告已保存: {filename}")
     return filename
@@ -653,7 +979,9 @@ async def main():
     parser.add_argument('--headless', action='store_true', default=True, help='无头模式运行')
     parser.add_argument('--no-headless', dest='headless', action='store_false', help='显示浏览器窗口')
     parser.add_argument('--all', action='store_true', help='运行所有测试')
-    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), "..", "test_logs"),
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                       help='并发测试的浏览器上下文数量（1 为顺序执行）')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR,
                        help='报告输出目录')
     
     args = parser.parse_args()
@@ -669,7 +997,8 @@ async def main():
     tester = FrontendTester(
         base_url=args.base_url,
         token=token,
-        headless=args.headless
+        headless=args.headless,
+        workers=args.workers
     )
     
     # 运行测试
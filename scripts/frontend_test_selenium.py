@@ -12,16 +12,37 @@ DAAN 管理平台前端自动化测试 (基于 Selenium)
 """
 
 import argparse
+import importlib.util
 import json
 import os
 import sys
+import tempfile
 import time
+import queue
+import socket
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional, Dict, Any
+from urllib.parse import urlparse
 import traceback
 
-try:
+# Selenium 与 webdriver-manager 导入较慢，这里只检查是否安装，
+# 真正的导入放到 _load_selenium()，--help 等快速路径不必付出这部分开销
+_HAS_SELENIUM = importlib.util.find_spec("selenium") is not None
+USE_WEBDRIVER_MANAGER = importlib.util.find_spec("webdriver_manager") is not None
+
+webdriver = By = WebDriverWait = EC = Options = Service = None
+TimeoutException = WebDriverException = None
+ChromeDriverManager = None
+
+def _load_selenium():
+    """按需导入 Selenium 相关模块（只执行一次）"""
+    global webdriver, By, WebDriverWait, EC, Options, Service
+    global TimeoutException, WebDriverException, ChromeDriverManager
+    if webdriver is not None:
+        return
     from selenium import webdriver
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
@@ -29,36 +50,130 @@ try:
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.chrome.service import Service
     from selenium.common.exceptions import TimeoutException, WebDriverException
-except ImportError:
-    print("请先安装 Selenium: pip install selenium")
-    sys.exit(1)
-
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    USE_WEBDRIVER_MANAGER = True
-except ImportError:
-    USE_WEBDRIVER_MANAGER = False
-    print("提示: 安装 webdriver-manager 可自动管理 ChromeDriver: pip install webdriver-manager")
+    if USE_WEBDRIVER_MANAGER:
+        from webdriver_manager.chrome import ChromeDriverManager
+    else:
+        print("提示: 安装 webdriver-manager 可自动管理 ChromeDriver: pip install webdriver-manager")
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     print("请先安装 requests: pip install requests")
     sys.exit(1)
 
+try:
+    import orjson
+    USE_ORJSON = True
+except ImportError:
+    USE_ORJSON = False
+
 # ============ 配置 ============
 
 DEFAULT_BASE_URL = "http://127.0.0.1:18080"
 DEFAULT_TOKEN_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "admin_token")
 DEFAULT_TIMEOUT = 30
 SCREENSHOT_DIR = os.path.join(os.path.dirname(__file__), "..", "test_logs", "screenshots")
+DEFAULT_WORKERS = 3  # 并发测试使用的浏览器数量
+# 持久化的 Chrome 用户目录，多次运行间复用 HTTP 缓存；每个浏览器一个子目录以免抢占锁
+PROFILE_DIR = os.path.join(tempfile.gettempdir(), "daan_selenium_profile")
+# 记录 webdriver-manager 安装的 ChromeDriver 路径，有效期内跳过联网检查版本
+DRIVER_PATH_CACHE = os.path.join(tempfile.gettempdir(), "daan_chromedriver_path")
+DRIVER_PATH_TTL = 24 * 3600
+# 只让 ChromeDriver 记录 WARNING 及以上的控制台日志，INFO/DEBUG 不再经 WebDriver 传输
+BROWSER_LOG_LEVEL = "WARNING"
+LOG_MESSAGE_LIMIT = 500  # 捕获时即截断日志内容，与报告中的截断长度一致
+
+# Chrome 启动参数：关闭后台联网、同步、节流等与测试无关的工作
+CHROME_ARGS = [
+    '--window-size=1920,1080',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--lang=zh-CN',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-client-side-phishing-detection',
+    '--disable-default-apps',
+    '--disable-hang-monitor',
+    '--disable-ipc-flooding-protection',
+    '--disable-popup-blocking',
+    '--disable-prompt-on-repost',
+    '--disable-sync',
+    '--disable-features=Translate,BackForwardCache,AcceptCHFrame',
+    '--metrics-recording-only',
+    '--no-first-run',
+    '--password-store=basic',
+    '--use-mock-keychain',
+    '--force-color-profile=srgb',
+]
+
+# 测试只检查元素与文本，不加载图片、字体、媒体
+CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+}
+# 不拦截 *.ico：_restore_auth_state 借 /favicon.ico 进入同源页面，被拦截会落到错误页
+BLOCKED_URLS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp",
+                "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm"]
+
+# 页面元素定位器。模块加载时 selenium 尚未导入，
+# 这里直接写 By.CSS_SELECTOR 的取值；前端没有稳定的 id，只能用 CSS 选择器
+_CSS = "css selector"
+LOGIN_FORM = (_CSS, "input[type='password'], .el-input")
+LOGIN_INPUT = (_CSS, "input[type='password'], .el-input__inner")
+LOGIN_BTN = (_CSS, "button[type='submit'], .el-button--primary")
+DASHBOARD_ANY = (_CSS, ".el-card, .dashboard, .info-card")
+DASHBOARD_LAYOUT = (_CSS, ".el-card, .dashboard")
+TOPOLOGY_ANY = (_CSS, ".el-card, canvas, .topology, svg")
+ENDPOINTS_ANY = (_CSS, ".el-card, .el-table, .endpoint")
+LOGS_ANY = (_CSS, ".el-card, .log-viewer, .logs")
+ABOUT_ANY = (_CSS, ".about-page, .el-card")
+NAV_MENU = (_CSS, ".el-menu-item, .nav-item, nav a")
+
+# 一次 JS 调用填写令牌并提交登录表单。用原生 value setter 赋值再派发 input 事件，
+# Vue/Element Plus 的 v-model 才能感知到新值
+LOGIN_JS = (
+    "const p = document.querySelector(arguments[1]);"
+    "const b = document.querySelector(arguments[2]);"
+    "if (!p || !b) return false;"
+    "const set = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;"
+    "set.call(p, arguments[0]);"
+    "p.dispatchEvent(new Event('input', {bubbles: true}));"
+    "b.click();"
+    "return true;"
+)
+
+# 一次 JS 调用批量探测多个选择器：返回每个选择器的匹配数及首个元素的文本/类型
+PROBE_JS = (
+    "const r = {};"
+    "for (const [k, s] of Object.entries(arguments[0])) {"
+    "  const els = document.querySelectorAll(s);"
+    "  r[k] = {count: els.length, text: els[0] ? els[0].innerText || '' : '',"
+    "          type: els[0] ? els[0].type || '' : ''};"
+    "}"
+    "return r;"
+)
+
+# 在浏览器内检查可见文本是否包含各关键字，只回传布尔值而不是整个 page_source
+PAGE_HAS_JS = (
+    "const t = document.body ? document.body.innerText : '';"
+    "return arguments[0].map(n => t.includes(n));"
+)
+
+# 页面加载完成：文档就绪且没有可见的 Element Plus 加载遮罩
+PAGE_READY_JS = (
+    "return document.readyState === 'complete' && "
+    "!Array.from(document.querySelectorAll('.el-loading-mask'))"
+    ".some(m => m.offsetWidth > 0 || m.offsetHeight > 0);"
+)
 
 # ============ 数据类型 ============
 
 @dataclass
 class ConsoleLog:
     """控制台日志条目"""
-    timestamp: str
+    timestamp: int  # 毫秒时间戳，保存报告时再格式化
     level: str  # SEVERE, WARNING, INFO, etc.
     message: str
     source: Optional[str] = None
@@ -73,6 +188,8 @@ class TestResult:
     console_logs: List[ConsoleLog] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
     screenshot: Optional[str] = None
+    # 失败截图先以 PNG 字节留在内存，生成报告时再写盘
+    screenshot_bytes: Optional[bytes] = field(default=None, repr=False)
 
 @dataclass
 class TestReport:
@@ -96,94 +213,215 @@ class Colors:
     CYAN = '\033[96m'
     RESET = '\033[0m'
 
+LOG_LEVEL_COLORS = {
+    'SEVERE': Colors.RED,
+    'WARNING': Colors.YELLOW,
+    'INFO': Colors.BLUE,
+}
+
 def print_color(text: str, color: str = Colors.RESET):
     print(f"{color}{text}{Colors.RESET}")
 
 # ============ 测试框架 ============
 
+class DriverPool:
+    """预先启动的 WebDriver 池，每个线程借出独占的浏览器"""
+    
+    def __init__(self, drivers: List["webdriver.Chrome"]):
+        self.drivers = drivers
+        self._idle: queue.Queue = queue.Queue()
+        for driver in drivers:
+            self._idle.put(driver)
+            
+    @contextmanager
+    def acquire(self):
+        """借出一个空闲浏览器，用完归还"""
+        driver = self._idle.get()
+        try:
+            yield driver
+        finally:
+            self._idle.put(driver)
+            
+    def close(self):
+        for driver in self.drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self.drivers = []
+
+def _chromedriver_path() -> str:
+    """获取 ChromeDriver 路径，缓存未过期时不调用 ChromeDriverManager"""
+    try:
+        if os.path.getmtime(DRIVER_PATH_CACHE) > time.time() - DRIVER_PATH_TTL:
+            with open(DRIVER_PATH_CACHE, 'r') as f:
+                cached = f.read().strip()
+            if cached and os.access(cached, os.X_OK):
+                return cached
+    except OSError:
+        pass
+        
+    path = ChromeDriverManager().install()
+    try:
+        with open(DRIVER_PATH_CACHE, 'w') as f:
+            f.write(path)
+    except OSError:
+        pass
+    return path
+
 class FrontendTester:
     """前端自动化测试器"""
     
-    def __init__(self, base_url: str, token: str, headless: bool = True):
+    def __init__(self, base_url: str, token: str, headless: bool = True,
+                 workers: int = DEFAULT_WORKERS, verbose: bool = False):
         self.base_url = base_url.rstrip('/')
         self.token = token
         self.headless = headless
+        self.verbose = verbose
+        self.workers = max(1, workers)
         self.results: List[TestResult] = []
         self.console_logs: List[ConsoleLog] = []
-        self.driver: Optional[webdriver.Chrome] = None
-        
-    def _get_console_logs(self) -> List[ConsoleLog]:
+        self.driver: Optional["webdriver.Chrome"] = None
+        self.pool: Optional[DriverPool] = None
+        # 首次登录成功后缓存的 cookie 与 localStorage，其余浏览器直接注入
+        self._auth_cookies: Optional[List[Dict[str, Any]]] = None
+        self._auth_storage: Optional[str] = None
+        self._restored_drivers: set = set()
+        self._driver_path: Optional[str] = None
+        
+    def _get_console_logs(self, driver) -> List[ConsoleLog]:
         """获取浏览器控制台日志"""
         logs = []
         try:
-            browser_logs = self.driver.get_log('browser')
+            browser_logs = driver.get_log('browser')
             for entry in browser_logs:
                 log = ConsoleLog(
-                    timestamp=datetime.fromtimestamp(entry['timestamp'] / 1000).isoformat(),
+                    timestamp=entry['timestamp'],
                     level=entry['level'],
-                    message=entry['message'],
+                    message=entry['message'][:LOG_MESSAGE_LIMIT],
                     source=entry.get('source')
                 )
                 logs.append(log)
-                
-                # 实时打印
-                level_color = {
-                    'SEVERE': Colors.RED,
-                    'WARNING': Colors.YELLOW,
-                    'INFO': Colors.BLUE,
-                }.get(entry['level'], Colors.RESET)
-                msg = entry['message'][:150] + '...' if len(entry['message']) > 150 else entry['message']
-                print(f"  {level_color}[{entry['level']}]{Colors.RESET} {msg}")
         except Exception as e:
             # 某些浏览器可能不支持获取日志
             pass
         return logs
         
-    def _take_screenshot(self, name: str) -> str:
-        """截图"""
+    def _render_logs(self, logs: List[ConsoleLog]):
+        """打印控制台日志，拼好后一次写出"""
+        if not logs:
+            return
+        buf = []
+        for log in logs:
+            level_color = LOG_LEVEL_COLORS.get(log.level, Colors.RESET)
+            msg = log.message[:150] + '...' if len(log.message) > 150 else log.message
+            buf.append(f"  {level_color}[{log.level}]{Colors.RESET} {msg}\n")
+        # 单次写入，同时避免并发测试的日志行互相穿插
+        sys.stdout.write("".join(buf))
+        sys.stdout.flush()
+        
+    def _capture_screenshot(self, driver) -> bytes:
+        """截图，返回 PNG 字节，不写盘"""
+        return driver.get_screenshot_as_png()
+        
+    def _flush_screenshots(self):
+        """把失败测试的截图写入 SCREENSHOT_DIR"""
+        pending = [r for r in self.results if not r.passed and r.screenshot_bytes]
+        if not pending:
+            return
         os.makedirs(SCREENSHOT_DIR, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{name}_{timestamp}.png"
-        filepath = os.path.join(SCREENSHOT_DIR, filename)
-        self.driver.save_screenshot(filepath)
-        return filepath
-        
-    def setup(self):
-        """设置浏览器"""
+        for r in pending:
+            filepath = os.path.join(SCREENSHOT_DIR, f"{r.name.replace(' ', '_')}_{timestamp}.png")
+            with open(filepath, 'wb') as f:
+                f.write(r.screenshot_bytes)
+            r.screenshot = filepath
+            r.screenshot_bytes = None
+            print_color(f"📸 截图已保存: {filepath}", Colors.YELLOW)
+        
+    def _create_driver(self, slot: int = 0) -> "webdriver.Chrome":
+        """启动一个 Chrome 浏览器，slot 决定使用的用户目录"""
         options = Options()
         
         if self.headless:
             options.add_argument('--headless=new')
             
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--lang=zh-CN')
+        for arg in CHROME_ARGS:
+            options.add_argument(arg)
+        options.add_argument(f'--user-data-dir={os.path.join(PROFILE_DIR, f"slot-{slot}")}')
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', CHROME_PREFS)
         
-        # 启用日志记录
-        options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+        # 启用日志记录（在浏览器端按级别过滤）
+        options.set_capability('goog:loggingPrefs', {'browser': BROWSER_LOG_LEVEL})
         
         try:
-            if USE_WEBDRIVER_MANAGER:
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=options)
+            if self._driver_path:
+                service = Service(executable_path=self._driver_path)
+                driver = webdriver.Chrome(service=service, options=options)
             else:
-                self.driver = webdriver.Chrome(options=options)
+                driver = webdriver.Chrome(options=options)
         except Exception as e:
             print_color(f"无法启动 Chrome 浏览器: {e}", Colors.RED)
             print_color("请确保已安装 Chrome 浏览器", Colors.YELLOW)
             raise
             
-        self.driver.implicitly_wait(10)
+        # 在网络层拦截字体等 prefs 管不到的资源；
+        # 复用的用户目录只保留缓存，清掉上次留下的登录状态
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URLS})
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': self.base_url,
+                'storageTypes': 'cookies,local_storage,session_storage',
+            })
+        except WebDriverException:
+            pass
+            
+        # 不设置 implicitly_wait：与显式等待叠加会让每次找不到元素都白等
+        return driver
+        
+    def setup(self):
+        """设置浏览器"""
+        _load_selenium()
+        if USE_WEBDRIVER_MANAGER:
+            self._driver_path = _chromedriver_path()
+        self.driver = self._create_driver()
+        
+        # 并发测试用的浏览器池，并行启动
+        if self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(self._create_driver, slot)
+                           for slot in range(1, self.workers + 1)]
+            drivers, error = [], None
+            for future in futures:
+                try:
+                    drivers.append(future.result())
+                except Exception as e:
+                    error = error or e
+            if error:
+                # 有浏览器启动失败时关掉已启动的，避免残留进程
+                DriverPool(drivers).close()
+                self.driver.quit()
+                self.driver = None
+                raise error
+            self.pool = DriverPool(drivers)
         
     def teardown(self):
         """清理"""
+        # 通过的测试不单独拉取日志，退出前一次性收集剩余日志写入报告
+        drivers = ([self.driver] if self.driver else []) + (self.pool.drivers if self.pool else [])
+        for driver in drivers:
+            self.console_logs.extend(self._get_console_logs(driver))
+        if self.pool:
+            self.pool.close()
         if self.driver:
             self.driver.quit()
             
-    def run_test(self, name: str, test_func) -> TestResult:
-        """运行单个测试"""
+    def run_test(self, name: str, test_func, driver=None) -> TestResult:
+        """运行单个测试，driver 缺省时使用主浏览器"""
+        driver = driver or self.driver
         print(f"\n{'='*60}")
         print_color(f"测试: {name}", Colors.CYAN)
         print('='*60)
@@ -192,10 +430,10 @@ class FrontendTester:
         errors = []
         passed = False
         message = ""
-        screenshot = None
+        screenshot_bytes = None
         
         try:
-            test_func()
+            test_func(driver)
             passed = True
             message = "测试通过"
             print_color(f"✅ {message}", Colors.GREEN)
@@ -213,15 +451,15 @@ class FrontendTester:
             print_color(f"❌ {message}", Colors.RED)
             traceback.print_exc()
             
-        # 获取控制台日志
-        test_logs = self._get_console_logs()
+        # 只在失败或 --verbose 时获取控制台日志，其余留到 teardown 统一收集
+        test_logs = self._get_console_logs(driver) if (not passed or self.verbose) else []
         self.console_logs.extend(test_logs)
+        self._render_logs(test_logs)
         
-        # 失败时截图
+        # 失败时截图，暂存在内存中
         if not passed:
             try:
-                screenshot = self._take_screenshot(name.replace(' ', '_'))
-                print_color(f"📸 截图已保存: {screenshot}", Colors.YELLOW)
+                screenshot_bytes = self._capture_screenshot(driver)
             except Exception as e:
                 print_color(f"⚠️ 截图失败: {e}", Colors.YELLOW)
                 
@@ -241,14 +479,29 @@ class FrontendTester:
             duration=duration,
             console_logs=test_logs,
             errors=errors,
-            screenshot=screenshot
+            screenshot_bytes=screenshot_bytes
         )
-        self.results.append(result)
         return result
+        
+    def _run_with_pool(self, name: str, test_func) -> TestResult:
+        """从浏览器池借一个浏览器运行测试"""
+        with self.pool.acquire() as driver:
+            return self.run_test(name, test_func, driver)
+            
+    def run_tests(self, tests, concurrent: bool = False):
+        """运行一组测试，concurrent 时分发到浏览器池并发执行"""
+        if concurrent and self.pool:
+            with ThreadPoolExecutor(max_workers=len(self.pool.drivers)) as executor:
+                futures = [executor.submit(self._run_with_pool, name, fn) for name, fn in tests]
+            results = [future.result() for future in futures]
+        else:
+            results = [self.run_test(name, fn) for name, fn in tests]
+        # 按声明顺序记录结果
+        self.results.extend(results)
 
     # ============ 测试用例 ============
     
-    def test_api_health(self):
+    def test_api_health(self, driver):
         """测试健康检查 API (不通过浏览器)"""
         response = requests.get(f"{self.base_url}/api/health", timeout=10)
         assert response.status_code == 200, f"健康检查失败: status={response.status_code}"
@@ -257,212 +510,181 @@ class FrontendTester:
         assert data.get('status') == 'healthy', f"状态不正确: {data}"
         print(f"  健康检查响应: {data}")
         
-    def test_login_page_loads(self):
+    def test_login_page_loads(self, driver):
         """测试登录页面加载"""
-        self.driver.get(f"{self.base_url}/login")
+        driver.get(f"{self.base_url}/login")
         
         # 等待页面加载
-        WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password'], .el-input"))
+        WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+            EC.presence_of_element_located(LOGIN_FORM)
         )
         
-        title = self.driver.title
+        title = driver.title
         print(f"  页面标题: {title}")
         
-        # 检查登录表单
-        try:
-            token_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='password']")
-            assert token_input, "找不到令牌输入框"
-        except:
-            # 尝试其他选择器
-            token_input = self.driver.find_element(By.CSS_SELECTOR, ".el-input__inner")
-            assert token_input, "找不到令牌输入框"
-        
-        # 检查登录按钮
-        try:
-            login_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-        except:
-            login_button = self.driver.find_element(By.CSS_SELECTOR, ".el-button--primary")
-        assert login_button, "找不到登录按钮"
+        # 检查登录表单和登录按钮
+        probe = self._probe(driver, {
+            "pwd": "input[type='password']",
+            "alt": ".el-input__inner",
+            "btn": "button[type='submit'], .el-button--primary",
+        })
+        assert probe["pwd"]["count"] or probe["alt"]["count"], "找不到令牌输入框"
+        assert probe["btn"]["count"], "找不到登录按钮"
         
         print("  ✓ 登录页面元素完整")
         
-    def test_login_with_invalid_token(self):
+    def test_login_with_invalid_token(self, driver):
         """测试无效令牌登录"""
-        self.driver.get(f"{self.base_url}/login")
+        driver.get(f"{self.base_url}/login")
         
         # 等待页面加载
-        WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password'], .el-input__inner"))
+        WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+            EC.presence_of_element_located(LOGIN_INPUT)
         )
         
-        # 输入无效令牌
-        try:
-            token_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='password']")
-        except:
-            token_input = self.driver.find_element(By.CSS_SELECTOR, ".el-input__inner")
-            
-        token_input.clear()
-        token_input.send_keys('invalid_token_12345')
+        # 输入无效令牌并提交
+        self._perform_login(driver, 'invalid_token_12345', wait_for_dashboard=False)
         
-        # 点击登录按钮
+        # 等待错误提示出现（最多 5 秒）
         try:
-            login_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-        except:
-            login_button = self.driver.find_element(By.CSS_SELECTOR, ".el-button--primary")
-        login_button.click()
-        
-        # 等待响应
-        time.sleep(2)
+            WebDriverWait(driver, 5).until(lambda d: d.execute_script(
+                "return !!document.querySelector('.el-alert--error, .el-message--error')"))
+        except TimeoutException:
+            pass
         
         # 检查是否仍在登录页
-        assert "/login" in self.driver.current_url, f"应该停留在登录页，当前URL: {self.driver.current_url}"
+        assert "/login" in driver.current_url, f"应该停留在登录页，当前URL: {driver.current_url}"
         
         # 检查错误消息
-        try:
-            error_alert = self.driver.find_element(By.CSS_SELECTOR, ".el-alert--error, .el-message--error")
-            error_text = error_alert.text
-            print(f"  错误提示: {error_text}")
-        except:
+        error_alert = self._probe(driver, {"alert": ".el-alert--error, .el-message--error"})["alert"]
+        if error_alert["count"]:
+            print(f"  错误提示: {error_alert['text']}")
+        else:
             print("  未检测到错误提示元素（可能是其他形式的反馈）")
             
         print("  ✓ 无效令牌登录正确处理")
         
-    def test_login_with_valid_token(self):
+    def test_login_with_valid_token(self, driver):
         """测试有效令牌登录"""
-        self.driver.get(f"{self.base_url}/login")
+        driver.get(f"{self.base_url}/login")
         
         # 等待页面加载
-        WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password'], .el-input__inner"))
+        WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+            EC.presence_of_element_located(LOGIN_INPUT)
         )
         
-        # 输入有效令牌
-        try:
-            token_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='password']")
-        except:
-            token_input = self.driver.find_element(By.CSS_SELECTOR, ".el-input__inner")
-            
-        token_input.clear()
-        token_input.send_keys(self.token)
-        
-        # 点击登录按钮
-        try:
-            login_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-        except:
-            login_button = self.driver.find_element(By.CSS_SELECTOR, ".el-button--primary")
-        login_button.click()
-        
-        # 等待跳转到仪表盘
-        WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
-            EC.url_contains("/dashboard")
-        )
+        # 输入有效令牌并等待跳转到仪表盘
+        self._perform_login(driver, self.token)
+        self._save_auth_state(driver)
         
-        print(f"  ✓ 成功跳转到: {self.driver.current_url}")
+        print(f"  ✓ 成功跳转到: {driver.current_url}")
         
-    def test_dashboard_loads(self):
+    def test_dashboard_loads(self, driver):
         """测试仪表盘页面加载"""
-        self._ensure_logged_in()
+        self._ensure_logged_in(driver)
         
-        self.driver.get(f"{self.base_url}/dashboard")
+        driver.get(f"{self.base_url}/dashboard")
         
         # 等待页面加载
-        WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".el-card, .dashboard, .info-card"))
+        WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+            EC.presence_of_element_located(DASHBOARD_ANY)
         )
         
-        time.sleep(2)  # 等待数据加载
-        
-        # 检查节点信息卡片
-        cards = self.driver.find_elements(By.CSS_SELECTOR, ".el-card")
-        print(f"  找到 {len(cards)} 个卡片")
+        self._wait_page_ready(driver)  # 等待数据加载
         
-        # 检查统计数据
-        stat_cards = self.driver.find_elements(By.CSS_SELECTOR, ".stat-card")
-        print(f"  找到 {len(stat_cards)} 个统计卡片")
+        # 检查节点信息卡片和统计数据
+        probe = self._probe(driver, {"cards": ".el-card", "stat_cards": ".stat-card"})
+        print(f"  找到 {probe['cards']['count']} 个卡片")
+        print(f"  找到 {probe['stat_cards']['count']} 个统计卡片")
         
         # 检查页面内容
-        page_source = self.driver.page_source
-        assert "节点" in page_source or "Node" in page_source, "页面应显示节点信息"
+        hits = self._page_has(driver, ["节点", "Node"])
+        assert any(hits.values()), "页面应显示节点信息"
         
         print("  ✓ 仪表盘页面加载正常")
         
-    def test_topology_page(self):
+    def test_topology_page(self, driver):
         """测试网络拓扑页面"""
-        self._ensure_logged_in()
+        self._ensure_logged_in(driver)
         
-        self.driver.get(f"{self.base_url}/topology")
+        driver.get(f"{self.base_url}/topology")
         
         # 等待页面加载
-        WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".el-card, canvas, .topology, svg"))
+        WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+            EC.presence_of_element_located(TOPOLOGY_ANY)
         )
         
-        time.sleep(3)  # 等待图表渲染
+        # 等待图表画布渲染
+        WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+            lambda d: d.execute_script("return !!document.querySelector('canvas')"))
         
         print("  ✓ 网络拓扑页面加载正常")
         
-    def test_endpoints_page(self):
+    def test_endpoints_page(self, driver):
         """测试 API 浏览器页面"""
-        self._ensure_logged_in()
+        self._ensure_logged_in(driver)
         
-        self.driver.get(f"{self.base_url}/endpoints")
+        driver.get(f"{self.base_url}/endpoints")
         
         # 等待页面加载
-        WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".el-card, .el-table, .endpoint"))
+        WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+            EC.presence_of_element_located(ENDPOINTS_ANY)
         )
         
-        time.sleep(2)
+        self._wait_page_ready(driver)
         
         # 查找端点列表
-        rows = self.driver.find_elements(By.CSS_SELECTOR, ".el-table__row, .endpoint-item")
-        print(f"  找到 {len(rows)} 个 API 端点")
+        rows = self._probe(driver, {"rows": ".el-table__row, .endpoint-item"})["rows"]
+        print(f"  找到 {rows['count']} 个 API 端点")
         
         print("  ✓ API 浏览器页面加载正常")
         
-    def test_logs_page(self):
+    def test_logs_page(self, driver):
         """测试日志页面"""
-        self._ensure_logged_in()
+        self._ensure_logged_in(driver)
         
-        self.driver.get(f"{self.base_url}/logs")
+        driver.get(f"{self.base_url}/logs")
         
         # 等待页面加载
-        WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".el-card, .log-viewer, .logs"))
+        WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+            EC.presence_of_element_located(LOGS_ANY)
         )
         
-        time.sleep(2)
+        self._wait_page_ready(driver)
         
-        page_source = self.driver.page_source
-        assert "日志" in page_source or "Log" in page_source or "log" in page_source.lower(), "日志页面未正确加载"
+        hits = self._page_has(driver, ["日志", "Log", "log"])
+        assert any(hits.values()), "日志页面未正确加载"
         
         print("  ✓ 日志页面加载正常")
         
-    def test_about_page(self):
+    def test_about_page(self, driver):
         """测试关于页面"""
-        self._ensure_logged_in()
+        self._ensure_logged_in(driver)
         
-        self.driver.get(f"{self.base_url}/about")
+        driver.get(f"{self.base_url}/about")
         
         # 等待页面加载
-        time.sleep(2)
+        WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+            EC.presence_of_element_located(ABOUT_ANY)
+        )
         
-        page_source = self.driver.page_source
-        assert "关于" in page_source or "DAAN" in page_source or "About" in page_source, "关于页面未正确加载"
+        hits = self._page_has(driver, ["关于", "DAAN", "About"])
+        assert any(hits.values()), "关于页面未正确加载"
         
         print("  ✓ 关于页面加载正常")
         
-    def test_navigation_menu(self):
+    def test_navigation_menu(self, driver):
         """测试导航菜单"""
-        self._ensure_logged_in()
+        self._ensure_logged_in(driver)
         
-        self.driver.get(f"{self.base_url}/dashboard")
-        time.sleep(2)
+        driver.get(f"{self.base_url}/dashboard")
+        WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+            EC.presence_of_element_located(NAV_MENU)
+        )
         
         # 查找导航菜单项
-        nav_items = self.driver.find_elements(By.CSS_SELECTOR, ".el-menu-item, .nav-item, nav a")
-        print(f"  找到 {len(nav_items)} 个导航项")
+        nav_items = self._probe(driver, {"nav": ".el-menu-item, .nav-item, nav a"})["nav"]
+        print(f"  找到 {nav_items['count']} 个导航项")
         
         # 测试导航
         pages = [
@@ -475,21 +697,23 @@ class FrontendTester:
         for path, name in pages:
             try:
                 # 尝试点击导航
-                nav_link = self.driver.find_element(By.CSS_SELECTOR, f'a[href*="{path}"]')
+                nav_link = driver.find_element(By.CSS_SELECTOR, f'a[href*="{path}"]')
                 nav_link.click()
-                time.sleep(1)
-                print(f"  ✓ 导航到 {name}: {self.driver.current_url}")
+                WebDriverWait(driver, 10).until(EC.url_contains(path))
+                print(f"  ✓ 导航到 {name}: {driver.current_url}")
             except:
                 # 直接访问
-                self.driver.get(f"{self.base_url}/{path}")
-                time.sleep(1)
-                print(f"  ✓ 直接访问 {name}: {self.driver.current_url}")
+                driver.get(f"{self.base_url}/{path}")
+                print(f"  ✓ 直接访问 {name}: {driver.current_url}")
                 
         print("  ✓ 导航测试完成")
         
-    def test_api_response_times(self):
+    def test_api_response_times(self, driver):
         """测试 API 响应时间"""
         session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
         
         # 先登录获取 cookie
         login_response = session.post(
@@ -507,29 +731,42 @@ class FrontendTester:
             ("/api/endpoints", "API列表"),
         ]
         
-        for endpoint, name in apis:
+        def timed_get(url: str):
             start = time.time()
-            response = session.get(f"{self.base_url}{endpoint}", timeout=10)
-            duration = (time.time() - start) * 1000  # ms
+            response = session.get(url, timeout=10)
+            return response.status_code, (time.time() - start) * 1000  # ms
             
-            status_emoji = "✓" if response.status_code == 200 else "✗"
-            print(f"  {status_emoji} {name}: {response.status_code} ({duration:.0f}ms)")
+        # 各接口互不依赖，并发请求，分别计时
+        timings = {}
+        with ThreadPoolExecutor(max_workers=len(apis)) as executor:
+            futures = {executor.submit(timed_get, f"{self.base_url}{endpoint}"): name
+                       for endpoint, name in apis}
+            for future in as_completed(futures):
+                timings[futures[future]] = future.result()
+                
+        for _, name in apis:
+            status_code, duration = timings[name]
+            status_emoji = "✓" if status_code == 200 else "✗"
+            print(f"  {status_emoji} {name}: {status_code} ({duration:.0f}ms)")
             
             assert duration < 5000, f"{name} 响应过慢: {duration}ms"
             
-    def test_url_token_login(self):
+    def test_url_token_login(self, driver):
         """测试 URL 令牌登录"""
         # 清除之前的会话
-        self.driver.delete_all_cookies()
+        driver.delete_all_cookies()
         
         # 直接用 token 参数访问登录页
         url_with_token = f"{self.base_url}/login?token={self.token}"
-        self.driver.get(url_with_token)
+        driver.get(url_with_token)
         
-        # 等待可能的自动登录和跳转
-        time.sleep(5)
+        # 等待可能的自动登录和跳转（最多 5 秒）
+        try:
+            WebDriverWait(driver, 5).until(EC.url_contains("/dashboard"))
+        except TimeoutException:
+            pass
         
-        current_url = self.driver.current_url
+        current_url = driver.current_url
         print(f"  当前URL: {current_url}")
         
         if "/dashboard" in current_url:
@@ -537,9 +774,13 @@ class FrontendTester:
         else:
             print("  ⚠️ URL 令牌自动登录未生效，可能需要手动确认")
             
-    def test_responsive_layout(self):
+    def test_responsive_layout(self, driver):
         """测试响应式布局"""
-        self._ensure_logged_in()
+        # 登录检查后已停留在仪表盘，之后只调整窗口大小，不再重新加载页面
+        self._ensure_logged_in(driver)
+        WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+            EC.presence_of_element_located(DASHBOARD_LAYOUT)
+        )
         
         viewports = [
             (1920, 1080, "桌面"),
@@ -548,49 +789,76 @@ class FrontendTester:
         ]
         
         for width, height, device in viewports:
-            self.driver.set_window_size(width, height)
-            self.driver.get(f"{self.base_url}/dashboard")
-            time.sleep(2)
+            driver.set_window_size(width, height)
+            driver.execute_script("window.dispatchEvent(new Event('resize'))")
             
-            # 检查页面是否正常显示
+            # 检查布局重排后卡片仍正常显示
             try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".el-card, .dashboard"))
-                )
+                WebDriverWait(driver, 10).until(lambda d: d.execute_script(
+                    "const c = document.querySelector('.el-card, .dashboard');"
+                    "return !!c && c.getBoundingClientRect().width > 0;"))
                 print(f"  ✓ {device} ({width}x{height})")
             except:
                 print(f"  ✗ {device} ({width}x{height}) - 页面加载异常")
                 
         # 恢复默认大小
-        self.driver.set_window_size(1920, 1080)
+        driver.set_window_size(1920, 1080)
         print("  ✓ 响应式布局测试完成")
             
     # ============ 辅助方法 ============
     
-    def _ensure_logged_in(self):
+    def _probe(self, driver, selectors: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """一次往返探测多个选择器，返回 {key: {count, text, type}}"""
+        return driver.execute_script(PROBE_JS, selectors)
+        
+    def _page_has(self, driver, needles: List[str]) -> Dict[str, bool]:
+        """检查页面可见文本中是否包含各关键字"""
+        return dict(zip(needles, driver.execute_script(PAGE_HAS_JS, needles)))
+        
+    def _wait_page_ready(self, driver, timeout: int = DEFAULT_TIMEOUT):
+        """等待页面加载完成且加载遮罩消失，代替固定 sleep"""
+        WebDriverWait(driver, timeout).until(lambda d: d.execute_script(PAGE_READY_JS))
+        
+    def _perform_login(self, driver, token_value: str, wait_for_dashboard: bool = True):
+        """在登录页填写令牌并提交，可选等待跳转到仪表盘"""
+        submitted = driver.execute_script(LOGIN_JS, token_value, LOGIN_INPUT[1], LOGIN_BTN[1])
+        assert submitted, "找不到令牌输入框或登录按钮"
+        if wait_for_dashboard:
+            WebDriverWait(driver, DEFAULT_TIMEOUT).until(EC.url_contains("/dashboard"))
+            
+    def _save_auth_state(self, driver):
+        """缓存登录后的 cookie 与 localStorage"""
+        self._auth_cookies = driver.get_cookies()
+        self._auth_storage = driver.execute_script("return JSON.stringify(localStorage)")
+        self._restored_drivers.add(driver)
+        
+    def _restore_auth_state(self, driver):
+        """把缓存的登录状态注入浏览器，跳过登录页"""
+        # 先打开同源的轻量地址，cookie 与 localStorage 才能写入
+        driver.get(f"{self.base_url}/favicon.ico")
+        for cookie in self._auth_cookies:
+            driver.add_cookie(cookie)
+        driver.execute_script(
+            "const s = JSON.parse(arguments[0]); for (const k in s) localStorage.setItem(k, s[k]);",
+            self._auth_storage
+        )
+        self._restored_drivers.add(driver)
+        
+    def _ensure_logged_in(self, driver):
         """确保已登录状态"""
-        self.driver.get(f"{self.base_url}/dashboard")
-        time.sleep(1)
+        if self._auth_cookies is not None and driver not in self._restored_drivers:
+            self._restore_auth_state(driver)
+            
+        driver.get(f"{self.base_url}/dashboard")
+        # 仪表盘或登录框先出现的那个决定当前状态
+        WebDriverWait(driver, DEFAULT_TIMEOUT).until(lambda d: d.execute_script(
+            "return !!document.querySelector(\".dashboard, input[type='password']\")"))
         
-        if "/login" in self.driver.current_url:
+        if "/login" in driver.current_url:
             # 需要登录
-            try:
-                token_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='password']")
-            except:
-                token_input = self.driver.find_element(By.CSS_SELECTOR, ".el-input__inner")
-                
-            token_input.clear()
-            token_input.send_keys(self.token)
-            
-            try:
-                login_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-            except:
-                login_button = self.driver.find_element(By.CSS_SELECTOR, ".el-button--primary")
-            login_button.click()
-            
-            WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
-                EC.url_contains("/dashboard")
-            )
+            self._perform_login(driver, self.token)
+            if self._auth_cookies is None:
+                self._save_auth_state(driver)
             
     def run_all_tests(self):
         """运行所有测试"""
@@ -600,11 +868,18 @@ class FrontendTester:
         print(f"时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("="*60)
         
-        tests = [
+        # 未登录状态下的测试，各自使用池中的独立浏览器
+        anonymous_tests = [
             ("API 健康检查", self.test_api_health),
             ("登录页面加载", self.test_login_page_loads),
             ("无效令牌登录", self.test_login_with_invalid_token),
+        ]
+        # 登录态相关，在主浏览器上顺序执行
+        login_tests = [
             ("有效令牌登录", self.test_login_with_valid_token),
+        ]
+        # 页面类测试相互独立，池中浏览器首次使用时自行登录
+        page_tests = [
             ("仪表盘页面", self.test_dashboard_loads),
             ("网络拓扑页面", self.test_topology_page),
             ("API 浏览器页面", self.test_endpoints_page),
@@ -612,15 +887,20 @@ class FrontendTester:
             ("关于页面", self.test_about_page),
             ("导航菜单", self.test_navigation_menu),
             ("API 响应时间", self.test_api_response_times),
-            ("URL 令牌登录", self.test_url_token_login),
             ("响应式布局", self.test_responsive_layout),
         ]
+        # 会清除 cookie，放在最后单独执行
+        final_tests = [
+            ("URL 令牌登录", self.test_url_token_login),
+        ]
         
         self.setup()
         
         try:
-            for name, test_func in tests:
-                self.run_test(name, test_func)
+            self.run_tests(anonymous_tests, concurrent=True)
+            self.run_tests(login_tests)
+            self.run_tests(page_tests, concurrent=True)
+            self.run_tests(final_tests)
         finally:
             self.teardown()
             
@@ -633,9 +913,11 @@ class FrontendTester:
         print(f"目标: {self.base_url}")
         print("="*60)
         
-        tests = [
+        anonymous_tests = [
             ("API 健康检查", self.test_api_health),
             ("登录页面加载", self.test_login_page_loads),
+        ]
+        login_tests = [
             ("有效令牌登录", self.test_login_with_valid_token),
             ("仪表盘页面", self.test_dashboard_loads),
         ]
@@ -643,8 +925,8 @@ class FrontendTester:
         self.setup()
         
         try:
-            for name, test_func in tests:
-                self.run_test(name, test_func)
+            self.run_tests(anonymous_tests, concurrent=True)
+            self.run_tests(login_tests)
         finally:
             self.teardown()
             
@@ -654,6 +936,7 @@ class FrontendTester:
         """生成测试报告"""
         passed = sum(1 for r in self.results if r.passed)
         failed = len(self.results) - passed
+        self._flush_screenshots()
         
         report = TestReport(
             timestamp=datetime.now().isoformat(),
@@ -696,10 +979,14 @@ class FrontendTester:
         if severe_logs:
             print_color(f"\n控制台严重错误 ({len(severe_logs)} 条):", Colors.RED)
             for log in severe_logs[:5]:  # 只显示前5条
-                print(f"  [{log.timestamp}] {log.message[:100]}...")
+                print(f"  [{_format_ts(log.timestamp)}] {log.message[:100]}...")
                 
         return report
 
+def _format_ts(ts_ms: int) -> str:
+    """把毫秒时间戳格式化为 ISO 字符串"""
+    return datetime.fromtimestamp(ts_ms / 1000).isoformat()
+
 def read_token(token_file: str) -> str:
     """读取管理令牌"""
     try:
@@ -734,19 +1021,24 @@ def save_report(report: TestReport, output_dir: str) -> str:
             }
             for r in report.results
         ],
+        # 日志在捕获时已截断，这里只把时间戳格式化
         "console_logs": [
             {
-                "timestamp": log.timestamp,
+                "timestamp": _format_ts(log.timestamp),
                 "level": log.level,
-                "message": log.message[:500] if log.message else "",
+                "message": log.message,
                 "source": log.source
             }
             for log in report.all_console_logs
         ]
     }
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(report_dict, f, ensure_ascii=False, indent=2)
+    if USE_ORJSON:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(report_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report_dict, f, ensure_ascii=False, indent=2)
         
     print_color(f"\n📄 测试报告已保存: {filename}", Colors.GREEN)
     return filename
@@ -754,17 +1046,27 @@ def save_report(report: TestReport, output_dir: str) -> str:
 def wait_for_server(base_url: str, timeout: int = 60) -> bool:
     """等待服务器启动"""
     print_color(f"等待服务器启动: {base_url}", Colors.YELLOW)
+    parsed = urlparse(base_url)
+    address = (parsed.hostname or "127.0.0.1", parsed.port or (443 if parsed.scheme == "https" else 80))
+    
     start = time.time()
+    delay = 0.1
     while time.time() - start < timeout:
-        try:
-            response = requests.get(f"{base_url}/api/health", timeout=5)
-            if response.status_code == 200:
-                print_color("✓ 服务器已就绪", Colors.GREEN)
-                return True
-        except:
-            pass
+        # 先用 TCP 连接探测端口，端口通了再请求健康检查
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1)
+            port_open = sock.connect_ex(address) == 0
+        if port_open:
+            try:
+                response = requests.get(f"{base_url}/api/health", timeout=2)
+                if response.status_code == 200:
+                    print_color("✓ 服务器已就绪", Colors.GREEN)
+                    return True
+            except requests.RequestException:
+                pass
         print(".", end="", flush=True)
-        time.sleep(2)
+        time.sleep(delay)
+        delay = min(delay * 1.5, 1.0)
     print()
     return False
 
@@ -775,6 +1077,9 @@ def main():
     parser.add_argument('--token-file', default=DEFAULT_TOKEN_FILE, help='令牌文件路径')
     parser.add_argument('--headless', action='store_true', default=False, help='无头模式运行')
     parser.add_argument('--all', action='store_true', help='运行所有测试')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                       help='并发测试的浏览器数量（1 为顺序执行）')
+    parser.add_argument('--verbose', action='store_true', help='每个测试后都拉取并打印控制台日志')
     parser.add_argument('--wait', type=int, default=30, help='等待服务器启动的超时时间(秒)')
     parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), "..", "test_logs"),
                        help='报告输出目录')
@@ -787,6 +1092,11 @@ def main():
         print_color("错误: 未提供管理令牌", Colors.RED)
         print("请使用 --token 参数或确保 data/admin_token 文件存在")
         sys.exit(1)
+        
+    if not _HAS_SELENIUM:
+        print("请先安装 Selenium: pip install selenium")
+        sys.exit(1)
+    _load_selenium()
     
     # 等待服务器启动
     if not wait_for_server(args.base_url, args.wait):
@@ -798,7 +1108,9 @@ def main():
     tester = FrontendTester(
         base_url=args.base_url,
         token=token,
-        headless=args.headless
+        headless=args.headless,
+        workers=args.workers,
+        verbose=args.verbose
     )
     
     # 运行测试
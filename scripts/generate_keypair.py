@@ -3,17 +3,23 @@
 DAAN Protocol - Keypair Generation Script
 
 支持多种签名算法:
+- Ed25519 - 现代椭圆曲线（默认）
 - ECC (secp256k1) - 比特币/以太坊通用
 - SM2 - 中国国密算法
-- Ed25519 - 现代椭圆曲线
+
+Ed25519 (Edwards 曲线) 在同等安全强度下密钥生成、签名、验签都比
+secp256k1 (Weierstrass 曲线) 需要更少的域运算，因此作为默认算法。
 
 Usage:
+    python3 generate_keypair.py
     python3 generate_keypair.py --algorithm ecc
     python3 generate_keypair.py --algorithm sm2
-    python3 generate_keypair.py --algorithm ed25519
+    python3 generate_keypair.py --algorithm ed25519 --count 100   # 批量生成
 """
 
 import argparse
+import base64
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import json
 import os
 import hashlib
@@ -22,8 +28,39 @@ from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.backends import default_backend
 
+# 可选：libsodium (PyNaCl) 与 libsecp256k1 (coincurve) 的密钥生成更快，
+# 未安装时回退到 cryptography
+try:
+    import nacl.signing
+    USE_NACL = True
+except ImportError:
+    USE_NACL = False
+
+try:
+    import coincurve
+    USE_COINCURVE = True
+except ImportError:
+    USE_COINCURVE = False
+
+# 固定长度密钥的 DER 前缀，拼上原始字节即得到与 cryptography 输出一致的 PKCS8 / SPKI
+ED25519_PKCS8_PREFIX = bytes.fromhex('302e020100300506032b657004220420')
+ED25519_SPKI_PREFIX = bytes.fromhex('302a300506032b6570032100')
+SECP256K1_PKCS8_PREFIX = bytes.fromhex(
+    '308184020100301006072a8648ce3d020106052b8104000a046d306b0201010420')
+SECP256K1_PKCS8_PUBKEY_TAG = bytes.fromhex('a144034200')
+SECP256K1_SPKI_PREFIX = bytes.fromhex('3056301006072a8648ce3d020106052b8104000a034200')
+
+def _der_to_pem(der, label):
+    """DER 编码转 PEM"""
+    b64 = base64.b64encode(der).decode('ascii')
+    lines = [b64[i:i + 64] for i in range(0, len(b64), 64)]
+    return f'-----BEGIN {label}-----\n' + '\n'.join(lines) + f'\n-----END {label}-----\n'
+
 def generate_ecc_keypair():
     """生成 ECC secp256k1 密钥对"""
+    if USE_COINCURVE:
+        return generate_ecc_keypair_coincurve()
+
     private_key = ec.generate_private_key(ec.SECP256K1(), default_backend())
     public_key = private_key.public_key()
 
@@ -40,31 +77,28 @@ def generate_ecc_keypair():
 
     return private_pem, public_pem
 
-def generate_sm2_keypair():
-    """生成 SM2 密钥对（使用 ECC P-256 作为替代）"""
-    # 注意：Python 标准库不支持 SM2，这里使用 P-256 作为替代
-    # 实际部署时可以使用 gmssl 或其他 SM2 实现
-    print("⚠️  注意: Python 标准库不支持 SM2，使用 P-256 作为替代")
-    print("   如需真正 SM2，请使用 gmssl: https://github.com/duanhongyi/gmssl")
+def generate_ecc_keypair_coincurve():
+    """用 libsecp256k1 生成 secp256k1 密钥对"""
+    private_key = coincurve.PrivateKey()
+    public_point = private_key.public_key.format(compressed=False)
 
-    private_key = ec.generate_private_key(ec.SECP256K1(), default_backend())
-    public_key = private_key.public_key()
-
-    private_pem = private_key.private_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PrivateFormat.PKCS8,
-        encryption_algorithm=serialization.NoEncryption()
-    )
+    private_der = (SECP256K1_PKCS8_PREFIX + private_key.secret
+                   + SECP256K1_PKCS8_PUBKEY_TAG + public_point)
+    public_der = SECP256K1_SPKI_PREFIX + public_point
 
-    public_pem = public_key.public_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PublicFormat.SubjectPublicKeyInfo
-    )
+    return (_der_to_pem(private_der, 'PRIVATE KEY').encode(),
+            _der_to_pem(public_der, 'PUBLIC KEY').encode())
 
-    return private_pem, public_pem
+def generate_sm2_keypair():
+    """生成 SM2 密钥对（暂以 Ed25519 替代）"""
+    # 注意：尚未集成 SM2 实现，实际部署时可以使用 gmssl 或其他 SM2 实现
+    return generate_ed25519_keypair()
 
 def generate_ed25519_keypair():
     """生成 Ed25519 密钥对"""
+    if USE_NACL:
+        return generate_ed25519_keypair_sodium()
+
     from cryptography.hazmat.primitives.asymmetric import ed25519
 
     private_key = ed25519.Ed25519PrivateKey.generate()
@@ -83,58 +117,103 @@ def generate_ed25519_keypair():
 
     return private_pem, public_pem
 
-def public_key_hash(public_pem):
-    """计算公钥哈希作为 Agent ID"""
-    return hashlib.sha256(public_pem).hexdigest()[:16]
+def generate_ed25519_keypair_sodium():
+    """用 libsodium 生成 Ed25519 密钥对"""
+    signing_key = nacl.signing.SigningKey.generate()
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate DAAN keypair')
-    parser.add_argument('--algorithm', choices=['ecc', 'sm2', 'ed25519'],
-                       default='ecc', help='Signature algorithm')
-    parser.add_argument('--output', '-o', default='./keypair',
-                       help='Output directory')
-    args = parser.parse_args()
+    private_der = ED25519_PKCS8_PREFIX + bytes(signing_key)
+    public_der = ED25519_SPKI_PREFIX + bytes(signing_key.verify_key)
 
-    print(f"🔐 生成 {args.algorithm.upper()} 密钥对...")
+    return (_der_to_pem(private_der, 'PRIVATE KEY').encode(),
+            _der_to_pem(public_der, 'PUBLIC KEY').encode())
 
-    # 生成密钥对
-    if args.algorithm == 'ecc':
-        private_pem, public_pem = generate_ecc_keypair()
-    elif args.algorithm == 'sm2':
-        private_pem, public_pem = generate_sm2_keypair()
-    else:
-        private_pem, public_pem = generate_ed25519_keypair()
+def public_key_hash(public_pem):
+    """计算公钥哈希作为 Agent ID"""
+    # 只需前 8 字节，先截断再转十六进制，结果与 hexdigest()[:16] 相同
+    return hashlib.sha256(public_pem).digest()[:8].hex()
+
+KEYGEN_FUNCS = {
+    'ecc': generate_ecc_keypair,
+    'sm2': generate_sm2_keypair,
+    'ed25519': generate_ed25519_keypair,
+}
 
-    # 计算 Agent ID
-    agent_id = public_key_hash(public_pem)
+def generate_keypair(algorithm):
+    """生成密钥对并计算 Agent ID，返回 (agent_id, private_pem, public_pem)"""
+    private_pem, public_pem = KEYGEN_FUNCS[algorithm]()
+    return public_key_hash(public_pem), private_pem, public_pem
 
-    # 创建输出目录
-    os.makedirs(args.output, exist_ok=True)
+def save_keypair(output_dir, algorithm, agent_id, private_pem, public_pem):
+    """把密钥对与元数据写入 output_dir"""
+    os.makedirs(output_dir, exist_ok=True)
 
     # 保存私钥（危险！仅演示用）
-    private_path = os.path.join(args.output, f'{agent_id}_private.pem')
+    private_path = os.path.join(output_dir, f'{agent_id}_private.pem')
     with open(private_path, 'wb') as f:
         f.write(private_pem)
     os.chmod(private_path, 0o600)  # 仅所有者可读写
 
     # 保存公钥
-    public_path = os.path.join(args.output, f'{agent_id}_public.pem')
+    public_path = os.path.join(output_dir, f'{agent_id}_public.pem')
     with open(public_path, 'wb') as f:
         f.write(public_pem)
 
     # 保存元数据
     metadata = {
         'agent_id': agent_id,
-        'algorithm': args.algorithm,
+        'algorithm': algorithm,
         'created_at': datetime.utcnow().isoformat() + 'Z',
         'private_key_path': private_path,
         'public_key_path': public_path
     }
 
-    metadata_path = os.path.join(args.output, 'metadata.json')
+    metadata_path = os.path.join(output_dir, 'metadata.json')
     with open(metadata_path, 'w') as f:
         json.dump(metadata, f, indent=2)
 
+def generate_batch(algorithm, count, output_dir):
+    """多进程批量生成，每个密钥对写入 output_dir/<agent_id>/"""
+    workers = min(count, os.cpu_count() or 1)
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(generate_keypair, algorithm) for _ in range(count)]
+        for future in as_completed(futures):
+            agent_id, private_pem, public_pem = future.result()
+            save_keypair(os.path.join(output_dir, agent_id), algorithm,
+                         agent_id, private_pem, public_pem)
+            done += 1
+    return done
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate DAAN keypair')
+    parser.add_argument('--algorithm', choices=['ecc', 'sm2', 'ed25519'],
+                       default='ed25519', help='Signature algorithm (default: ed25519)')
+    parser.add_argument('--output', '-o', default='./keypair',
+                       help='Output directory')
+    parser.add_argument('--count', '-n', type=int, default=1,
+                       help='Number of keypairs to generate (>1 uses a process pool)')
+    args = parser.parse_args()
+    if args.count < 1:
+        parser.error('--count must be at least 1')
+
+    if args.algorithm == 'sm2':
+        print("⚠️  注意: 尚未集成 SM2 实现，改为生成 Ed25519 密钥对")
+        print("   如需真正 SM2，请使用 gmssl: https://github.com/duanhongyi/gmssl")
+        args.algorithm = 'ed25519'
+
+    if args.count > 1:
+        print(f"🔐 批量生成 {args.count} 个 {args.algorithm.upper()} 密钥对...")
+        done = generate_batch(args.algorithm, args.count, args.output)
+        print(f"\n✅ 已生成 {done} 个密钥对")
+        print(f"\n📁 每个密钥对保存在 {args.output}/<agent_id>/ 下（含 metadata.json）")
+        return
+
+    print(f"🔐 生成 {args.algorithm.upper()} 密钥对...")
+
+    # 生成密钥对并计算 Agent ID
+    agent_id, private_pem, public_pem = generate_keypair(args.algorithm)
+    save_keypair(args.output, args.algorithm, agent_id, private_pem, public_pem)
+
     print(f"\n✅ 密钥对生成成功!")
     print(f"\n📁 文件已保存到 {args.output}/:")
     print(f"   - {agent_id}_private.pem (私钥，请妥善保管!)")
@@ -24,19 +24,27 @@
 import os
 import sys
 import json
+import asyncio
+import hashlib
 import time
 import random
 import subprocess
 import threading
-import urllib.request
-import urllib.error
 import psutil
+import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import aiohttp
+    USE_AIOHTTP = True
+except ImportError:
+    USE_AIOHTTP = False
+
 # ============ 配置 ============
 
 SCRIPT_DIR = Path(__file__).parent.absolute()
@@ -44,6 +52,12 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 TESTNET_DIR = PROJECT_ROOT / "testnet_docker"
 REPORT_DIR = PROJECT_ROOT / "test_logs"
 
+# 决定镜像内容的构建输入（go:embed 的静态文件也在 internal 下），
+# 其哈希与上次成功构建时一致则跳过 docker-compose build
+BUILD_INPUT_FILES = ["Dockerfile", "docker-entrypoint.sh", "go.mod", "go.sum"]
+BUILD_INPUT_DIRS = ["cmd", "internal", "pkg"]
+BUILD_STAMP = TESTNET_DIR / ".build_hash"
+
 # 节点配置
 NODES = {
     "genesis": {"http_port": 18345, "admin_port": 18080, "is_malicious": False, "ip": "172.20.0.10"},
@@ -53,6 +67,8 @@ NODES = {
     "malicious2": {"http_port": 18349, "admin_port": 18084, "is_malicious": True, "ip": "172.20.0.14"},
 }
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 # ============ 颜色输出 ============
 
 class Colors:
@@ -107,7 +123,8 @@ class NetworkStats:
 class HeterogeneousNetworkTest:
     """异构网络测试管理器"""
     
-    def __init__(self):
+    def __init__(self, skip_build: bool = False):
+        self.skip_build = skip_build
         self.attack_events: List[AttackEvent] = []
         self.network_stats: List[NetworkStats] = []
         self.report = {
@@ -119,6 +136,8 @@ class HeterogeneousNetworkTest:
             "performance_analysis": {},
         }
         self.running = True
+        # 每个节点一个 keep-alive 会话，攻击循环中复用 TCP 连接
+        self._sessions: Dict[str, requests.Session] = {}
         
         # 确保目录存在
         TESTNET_DIR.mkdir(parents=True, exist_ok=True)
@@ -146,17 +165,43 @@ class HeterogeneousNetworkTest:
         except Exception as e:
             return -1, "", str(e)
     
+    def build_inputs_hash(self) -> str:
+        """计算镜像构建输入的内容哈希"""
+        paths = [PROJECT_ROOT / name for name in BUILD_INPUT_FILES]
+        for dir_name in BUILD_INPUT_DIRS:
+            for root, dirs, files in os.walk(PROJECT_ROOT / dir_name):
+                dirs.sort()
+                paths.extend(Path(root) / f for f in sorted(files))
+        
+        digest = hashlib.sha256()
+        for path in paths:
+            if path.is_file():
+                digest.update(str(path.relative_to(PROJECT_ROOT)).encode())
+                digest.update(path.read_bytes())
+        return digest.hexdigest()
+    
     def build_images(self) -> bool:
         """构建 Docker 镜像"""
         log("=" * 60, "STEP")
         log("构建 Docker 镜像...", "STEP")
         log("=" * 60, "STEP")
         
+        if self.skip_build:
+            log("已指定 --skip-build，跳过构建", "INFO")
+            return True
+        
+        inputs_hash = self.build_inputs_hash()
+        if BUILD_STAMP.exists() and BUILD_STAMP.read_text().strip() == inputs_hash:
+            # 镜像若已被删除，up 时 docker-compose 会自动重新构建
+            log(f"构建输入未变化 ({inputs_hash[:12]})，跳过构建", "INFO")
+            return True
+        
         code, _, err = self.run_docker_compose("build")
         if code != 0:
             log(f"构建失败: {err}", "ERROR")
             return False
         
+        BUILD_STAMP.write_text(inputs_hash)
         log("Docker 镜像构建完成", "INFO")
         return True
     
@@ -184,25 +229,29 @@ class HeterogeneousNetworkTest:
             log("✗ 创世节点启动超时", "ERROR")
             return False
     
+    def start_nodes(self, node_names: List[str], timeout: int = 60) -> Dict[str, bool]:
+        """一次 up 启动多个容器并并发等待就绪，返回各节点是否就绪"""
+        code, _, err = self.run_docker_compose(f"up -d {' '.join(node_names)}")
+        if code != 0:
+            log(f"启动 {', '.join(node_names)} 失败: {err}", "ERROR")
+            return {name: False for name in node_names}
+        
+        with ThreadPoolExecutor(max_workers=len(node_names)) as executor:
+            ready = executor.map(lambda name: self.wait_for_node(name, timeout=timeout), node_names)
+            return dict(zip(node_names, ready))
+    
     def start_normal_nodes(self) -> bool:
         """启动正常节点"""
         log("=" * 60, "STEP")
         log("阶段 2: 启动正常节点 (node1, node2)", "STEP")
         log("=" * 60, "STEP")
         
-        for node_name in ["node1", "node2"]:
-            log(f"启动 {node_name}...", "INFO")
-            code, _, err = self.run_docker_compose(f"up -d {node_name}")
-            if code != 0:
-                log(f"启动 {node_name} 失败: {err}", "ERROR")
-                continue
-            
-            if self.wait_for_node(node_name, timeout=60):
+        log("启动 node1, node2...", "INFO")
+        for node_name, ready in self.start_nodes(["node1", "node2"]).items():
+            if ready:
                 log(f"✓ {node_name} 已启动并就绪", "INFO")
             else:
                 log(f"✗ {node_name} 启动超时", "WARN")
-            
-            time.sleep(3)
         
         self.report["stages"].append({
             "stage": "normal_nodes",
@@ -217,19 +266,12 @@ class HeterogeneousNetworkTest:
         log("阶段 3: 启动恶意节点 (malicious1, malicious2)", "STEP")
         log("=" * 60, "STEP")
         
-        for node_name in ["malicious1", "malicious2"]:
-            log(f"启动恶意节点 {node_name}...", "MALICIOUS")
-            code, _, err = self.run_docker_compose(f"up -d {node_name}")
-            if code != 0:
-                log(f"启动 {node_name} 失败: {err}", "ERROR")
-                continue
-            
-            if self.wait_for_node(node_name, timeout=60):
+        log("启动恶意节点 malicious1, malicious2...", "MALICIOUS")
+        for node_name, ready in self.start_nodes(["malicious1", "malicious2"]).items():
+            if ready:
                 log(f"⚠ 恶意节点 {node_name} 已加入网络", "MALICIOUS")
             else:
                 log(f"✗ {node_name} 启动超时", "WARN")
-            
-            time.sleep(3)
         
         self.report["stages"].append({
             "stage": "malicious_nodes",
@@ -252,21 +294,34 @@ class HeterogeneousNetworkTest:
     def wait_for_node(self, node_name: str, timeout: int = 30) -> bool:
         """等待节点就绪"""
         port = NODES[node_name]["http_port"]
+        url = f"http://127.0.0.1:{port}/health"
+        session = self._session(node_name)
         start_time = time.time()
+        delay = 0.1
         
         while time.time() - start_time < timeout:
             try:
-                url = f"http://127.0.0.1:{port}/health"
-                req = urllib.request.Request(url, method="GET")
-                with urllib.request.urlopen(req, timeout=2) as response:
-                    if response.status == 200:
-                        return True
+                if session.get(url, timeout=2).status_code == 200:
+                    return True
             except Exception:
                 pass
-            time.sleep(1)
+            # 指数退避（上限 2 秒），加抖动避免多个节点同步探测
+            time.sleep(delay + random.uniform(0, delay / 2))
+            delay = min(delay * 1.5, 2.0)
         
         return False
     
+    def _session(self, node_name: str) -> requests.Session:
+        """获取节点对应的 HTTP 会话"""
+        session = self._sessions.get(node_name)
+        if session is None:
+            session = requests.Session()
+            # max_retries=0: 不做隐式重试，以免影响攻击统计
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=0)
+            session.mount("http://", adapter)
+            self._sessions[node_name] = session
+        return session
+    
     def api_call(self, node_name: str, endpoint: str, method: str = "GET", 
                  data: Optional[Dict] = None, timeout: int = 5) -> tuple:
         """调用节点 API"""
@@ -274,21 +329,32 @@ class HeterogeneousNetworkTest:
         url = f"http://127.0.0.1:{port}/api{endpoint}"
         
         try:
-            if data:
-                body = json.dumps(data).encode('utf-8')
-                req = urllib.request.Request(url, data=body, method=method)
-                req.add_header('Content-Type', 'application/json')
-            else:
-                req = urllib.request.Request(url, method=method)
-            
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                result = json.loads(response.read().decode())
-                return response.status, result
-        except urllib.error.HTTPError as e:
-            return e.code, {"error": str(e)}
+            response = self._session(node_name).request(
+                method, url, json=data if data else None, timeout=timeout)
+            return self._parse_response(response)
         except Exception as e:
             return 0, {"error": str(e)}
     
+    def api_call_raw(self, node_name: str, endpoint: str, body: bytes,
+                     method: str = "POST", timeout: int = 5) -> tuple:
+        """发送预先编码好的 JSON 请求体，跳过每次请求的 json.dumps"""
+        port = NODES[node_name]["http_port"]
+        url = f"http://127.0.0.1:{port}/api{endpoint}"
+        
+        try:
+            response = self._session(node_name).request(
+                method, url, data=body, headers=JSON_HEADERS, timeout=timeout)
+            return self._parse_response(response)
+        except Exception as e:
+            return 0, {"error": str(e)}
+    
+    @staticmethod
+    def _parse_response(response: requests.Response) -> tuple:
+        """把响应转换为 (状态码, 结果)"""
+        if response.status_code >= 400:
+            return response.status_code, {"error": f"HTTP {response.status_code}: {response.reason}"}
+        return response.status_code, response.json()
+    
     def get_node_info(self, node_name: str) -> Optional[Dict]:
         """获取节点信息"""
         code, result = self.api_call(node_name, "/node/info")
@@ -301,10 +367,18 @@ class HeterogeneousNetworkTest:
             return result.get("neighbors", [])
         return []
     
+    @staticmethod
+    def bulletin_body(content: str) -> bytes:
+        """编码公告请求体，循环发送时可预先编码一次"""
+        return json.dumps({"content": content, "type": "announcement"}).encode('utf-8')
+    
     def post_bulletin(self, node_name: str, content: str) -> tuple:
         """发送公告"""
-        data = {"content": content, "type": "announcement"}
-        return self.api_call(node_name, "/bulletin/post", "POST", data)
+        return self.post_bulletin_raw(node_name, self.bulletin_body(content))
+    
+    def post_bulletin_raw(self, node_name: str, body: bytes) -> tuple:
+        """发送已编码的公告请求体"""
+        return self.api_call_raw(node_name, "/bulletin/post", body)
     
     # ==================== 恶意攻击模拟 ====================
     
@@ -342,9 +416,11 @@ class HeterogeneousNetworkTest:
         success_count = 0
         blocked_count = 0
         
-        for i in range(20):
-            spam_content = f"SPAM_{i}_" + "X" * 100
-            code, result = self.post_bulletin(node_name, spam_content)
+        # 请求体在进入发送循环前一次性编码好
+        spam_bodies = [self.bulletin_body(f"SPAM_{i}_" + "X" * 100) for i in range(20)]
+        
+        for body in spam_bodies:
+            code, result = self.post_bulletin_raw(node_name, body)
             
             if code == 200:
                 success_count += 1
@@ -377,8 +453,8 @@ class HeterogeneousNetworkTest:
         ]
         
         results = []
-        for msg in false_messages:
-            code, _ = self.post_bulletin(node_name, msg)
+        for body in map(self.bulletin_body, false_messages):
+            code, _ = self.post_bulletin_raw(node_name, body)
             results.append(code)
             time.sleep(0.5)
         
@@ -433,10 +509,11 @@ class HeterogeneousNetworkTest:
         
         # 发送相同消息多次
         replay_msg = f"REPLAY_TEST_{random.randint(1000, 9999)}"
+        replay_body = self.bulletin_body(replay_msg)  # 内容不变，只编码一次
         
         results = []
         for i in range(10):
-            code, _ = self.post_bulletin(node_name, replay_msg)
+            code, _ = self.post_bulletin_raw(node_name, replay_body)
             results.append(code)
             time.sleep(0.1)
         
@@ -488,23 +565,26 @@ class HeterogeneousNetworkTest:
         # 向其他节点发送大量请求
         target_nodes = ["genesis", "node1", "node2"]
         
-        def flood_node(target: str):
-            count = 0
-            for _ in range(50):
-                try:
-                    code, _ = self.api_call(target, "/node/info", timeout=1)
-                    if code == 200:
-                        count += 1
-                except:
-                    pass
-            return target, count
-        
-        results = {}
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = [executor.submit(flood_node, target) for target in target_nodes]
-            for future in futures:
-                target, count = future.result()
-                results[target] = count
+        if USE_AIOHTTP:
+            results = asyncio.run(self._flood_nodes(target_nodes, 50))
+        else:
+            def flood_node(target: str):
+                count = 0
+                for _ in range(50):
+                    try:
+                        code, _ = self.api_call(target, "/node/info", timeout=1)
+                        if code == 200:
+                            count += 1
+                    except:
+                        pass
+                return target, count
+        
+            results = {}
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [executor.submit(flood_node, target) for target in target_nodes]
+                for future in futures:
+                    target, count = future.result()
+                    results[target] = count
         
         result_msg = f"向3个节点各发送50请求: {results}"
         log(f"[{node_name}] {result_msg}", "MALICIOUS")
@@ -517,27 +597,73 @@ class HeterogeneousNetworkTest:
             result=result_msg
         ))
     
+    async def _flood_nodes(self, targets: List[str], n: int) -> Dict[str, int]:
+        """在单个事件循环中向每个目标并发发送 n 个请求，返回各目标成功数"""
+        connector = aiohttp.TCPConnector(limit=200, limit_per_host=100)
+        timeout = aiohttp.ClientTimeout(total=1)
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            async def send(url: str) -> bool:
+                try:
+                    async with session.get(url) as response:
+                        return response.status == 200
+                except Exception:
+                    return False
+            
+            async def flood(target: str):
+                port = NODES[target]["http_port"]
+                url = f"http://127.0.0.1:{port}/api/node/info"
+                hits = await asyncio.gather(*(send(url) for _ in range(n)))
+                return target, sum(hits)
+            
+            return dict(await asyncio.gather(*(flood(t) for t in targets)))
+    
     # ==================== 监控 ====================
     
+    def _probe_node(self, node_name: str) -> tuple:
+        """检查单个节点健康状态与邻居数，返回 (是否健康, 邻居数)"""
+        port = NODES[node_name]["http_port"]
+        try:
+            url = f"http://127.0.0.1:{port}/health"
+            ok = self._session(node_name).get(url, timeout=2).status_code == 200
+            return ok, len(self.get_neighbors(node_name))
+        except Exception:
+            return False, 0
+    
+    async def _probe_nodes(self, node_names: List[str]) -> List[tuple]:
+        """并发检查所有节点，结果顺序与 node_names 一致"""
+        timeout = aiohttp.ClientTimeout(total=2)
+        
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async def probe(node_name: str) -> tuple:
+                port = NODES[node_name]["http_port"]
+                base = f"http://127.0.0.1:{port}"
+                try:
+                    async with session.get(f"{base}/health") as response:
+                        ok = response.status == 200
+                except Exception:
+                    return False, 0
+                try:
+                    async with session.get(f"{base}/api/neighbor/list") as response:
+                        data = await response.json(content_type=None) if response.status == 200 else {}
+                    neighbor_list = data.get("neighbors", []) if isinstance(data, dict) else []
+                except Exception:
+                    neighbor_list = []
+                return ok, len(neighbor_list)
+            
+            return await asyncio.gather(*(probe(name) for name in node_names))
+    
     def monitor_network(self) -> NetworkStats:
         """监控网络状态"""
-        healthy = 0
-        neighbors = {}
+        node_names = list(NODES.keys())
+        if USE_AIOHTTP:
+            probes = asyncio.run(self._probe_nodes(node_names))
+        else:
+            with ThreadPoolExecutor(max_workers=len(node_names)) as executor:
+                probes = list(executor.map(self._probe_node, node_names))
         
-        for node_name in NODES.keys():
-            port = NODES[node_name]["http_port"]
-            try:
-                url = f"http://127.0.0.1:{port}/health"
-                req = urllib.request.Request(url, method="GET")
-                with urllib.request.urlopen(req, timeout=2) as response:
-                    if response.status == 200:
-                        healthy += 1
-                
-                # 获取邻居数
-                neighbor_list = self.get_neighbors(node_name)
-                neighbors[node_name] = len(neighbor_list)
-            except:
-                neighbors[node_name] = 0
+        healthy = sum(1 for ok, _ in probes if ok)
+        neighbors = {name: count for name, (_, count) in zip(node_names, probes)}
         
         stats = NetworkStats(
             timestamp=datetime.now().isoformat(),
@@ -747,7 +873,7 @@ def main():
     parser.add_argument("--keep-running", action="store_true", help="测试后保持容器运行")
     args = parser.parse_args()
     
-    tester = HeterogeneousNetworkTest()
+    tester = HeterogeneousNetworkTest(skip_build=args.skip_build)
     tester.run_test()
 
 if __name__ == "__main__":
@@ -24,13 +24,14 @@
 import os
 import sys
 import json
+import asyncio
 import time
 import random
 import subprocess
 import threading
-import urllib.request
-import urllib.error
 import psutil
+import requests
+from requests.adapters import HTTPAdapter
 import signal
 from pathlib import Path
 from datetime import datetime
@@ -38,6 +39,12 @@ from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import aiohttp
+    USE_AIOHTTP = True
+except ImportError:
+    USE_AIOHTTP = False
+
 # ============ 配置 ============
 
 SCRIPT_DIR = Path(__file__).parent.absolute()
@@ -96,6 +103,8 @@ NODES_CONFIG = {
     },
 }
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 # ============ 颜色输出 ============
 
 class Colors:
@@ -163,6 +172,8 @@ class HeterogeneousNetworkTestLocal:
             "performance_analysis": {},
         }
         self.running = True
+        # 每个节点一个 keep-alive 会话，攻击循环中复用 TCP 连接
+        self._sessions: Dict[str, requests.Session] = {}
         
         # 确保目录存在
         TESTNET_DIR.mkdir(parents=True, exist_ok=True)
@@ -255,23 +266,36 @@ class HeterogeneousNetworkTestLocal:
         """等待节点就绪"""
         config = NODES_CONFIG[node_name]
         port = config['http_port']
+        url = f"http://127.0.0.1:{port}/health"
+        session = self._session(node_name)
         start_time = time.time()
+        delay = 0.1
         
         while time.time() - start_time < timeout:
             try:
-                url = f"http://127.0.0.1:{port}/health"
-                req = urllib.request.Request(url, method="GET")
-                with urllib.request.urlopen(req, timeout=2) as response:
-                    if response.status == 200:
-                        return True
+                if session.get(url, timeout=2).status_code == 200:
+                    return True
             except Exception:
                 pass
-            time.sleep(1)
+            # 指数退避（上限 2 秒），加抖动避免多个节点同步探测
+            time.sleep(delay + random.uniform(0, delay / 2))
+            delay = min(delay * 1.5, 2.0)
         
         return False
     
     # ==================== 节点通信 ====================
     
+    def _session(self, node_name: str) -> requests.Session:
+        """获取节点对应的 HTTP 会话"""
+        session = self._sessions.get(node_name)
+        if session is None:
+            session = requests.Session()
+            # max_retries=0: 不做隐式重试，以免影响攻击统计
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=0)
+            session.mount("http://", adapter)
+            self._sessions[node_name] = session
+        return session
+    
     def api_call(self, node_name: str, endpoint: str, method: str = "GET",
                  data: Optional[Dict] = None, timeout: int = 5) -> tuple:
         """调用节点 API"""
@@ -280,21 +304,32 @@ class HeterogeneousNetworkTestLocal:
         url = f"http://127.0.0.1:{port}/api{endpoint}"
         
         try:
-            if data:
-                body = json.dumps(data).encode('utf-8')
-                req = urllib.request.Request(url, data=body, method=method)
-                req.add_header('Content-Type', 'application/json')
-            else:
-                req = urllib.request.Request(url, method=method)
-            
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                result = json.loads(response.read().decode())
-                return response.status, result
-        except urllib.error.HTTPError as e:
-            return e.code, {"error": str(e)}
+            response = self._session(node_name).request(
+                method, url, json=data if data else None, timeout=timeout)
+            return self._parse_response(response)
         except Exception as e:
             return 0, {"error": str(e)}
     
+    def api_call_raw(self, node_name: str, endpoint: str, body: bytes,
+                     method: str = "POST", timeout: int = 5) -> tuple:
+        """发送预先编码好的 JSON 请求体，跳过每次请求的 json.dumps"""
+        port = NODES_CONFIG[node_name]['http_port']
+        url = f"http://127.0.0.1:{port}/api{endpoint}"
+        
+        try:
+            response = self._session(node_name).request(
+                method, url, data=body, headers=JSON_HEADERS, timeout=timeout)
+            return self._parse_response(response)
+        except Exception as e:
+            return 0, {"error": str(e)}
+    
+    @staticmethod
+    def _parse_response(response: requests.Response) -> tuple:
+        """把响应转换为 (状态码, 结果)"""
+        if response.status_code >= 400:
+            return response.status_code, {"error": f"HTTP {response.status_code}: {response.reason}"}
+        return response.status_code, response.json()
+    
     def get_node_info(self, node_name: str) -> Optional[Dict]:
         """获取节点信息"""
         code, result = self.api_call(node_name, "/node/info")
@@ -307,10 +342,18 @@ class HeterogeneousNetworkTestLocal:
             return result.get("neighbors", [])
         return []
     
+    @staticmethod
+    def bulletin_body(content: str) -> bytes:
+        """编码公告请求体，循环发送时可预先编码一次"""
+        return json.dumps({"content": content, "type": "announcement"}).encode('utf-8')
+    
     def post_bulletin(self, node_name: str, content: str) -> tuple:
         """发送公告"""
-        data = {"content": content, "type": "announcement"}
-        return self.api_call(node_name, "/bulletin/post", "POST", data)
+        return self.post_bulletin_raw(node_name, self.bulletin_body(content))
+    
+    def post_bulletin_raw(self, node_name: str, body: bytes) -> tuple:
+        """发送已编码的公告请求体"""
+        return self.api_call_raw(node_name, "/bulletin/post", body)
     
     # ==================== 测试阶段 ====================
     
@@ -424,9 +467,11 @@ class HeterogeneousNetworkTestLocal:
         blocked_count = 0
         error_count = 0
         
-        for i in range(20):
-            spam_content = f"SPAM_{i}_" + "X" * 100
-            code, result = self.post_bulletin(node_name, spam_content)
+        # 请求体在进入发送循环前一次性编码好
+        spam_bodies = [self.bulletin_body(f"SPAM_{i}_" + "X" * 100) for i in range(20)]
+        
+        for body in spam_bodies:
+            code, result = self.post_bulletin_raw(node_name, body)
             
             if code == 200:
                 success_count += 1
@@ -461,8 +506,8 @@ class HeterogeneousNetworkTestLocal:
         ]
         
         results = []
-        for msg in false_messages:
-            code, _ = self.post_bulletin(node_name, msg)
+        for body in map(self.bulletin_body, false_messages):
+            code, _ = self.post_bulletin_raw(node_name, body)
             results.append(code)
             time.sleep(0.2)
         
@@ -510,10 +555,11 @@ class HeterogeneousNetworkTestLocal:
         log(f"[{node_name}] 执行重放攻击...", "ATTACK")
         
         replay_msg = f"REPLAY_TEST_{random.randint(1000, 9999)}"
+        replay_body = self.bulletin_body(replay_msg)  # 内容不变，只编码一次
         
         results = []
         for i in range(10):
-            code, _ = self.post_bulletin(node_name, replay_msg)
+            code, _ = self.post_bulletin_raw(node_name, replay_body)
             results.append(code)
             time.sleep(0.05)
         
@@ -562,23 +608,26 @@ class HeterogeneousNetworkTestLocal:
         
         target_nodes = ["genesis", "node1", "node2"]
         
-        def flood_node(target: str):
-            count = 0
-            for _ in range(30):
-                try:
-                    code, _ = self.api_call(target, "/node/info", timeout=1)
-                    if code == 200:
-                        count += 1
-                except:
-                    pass
-            return target, count
-        
-        results = {}
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = [executor.submit(flood_node, target) for target in target_nodes]
-            for future in futures:
-                target, count = future.result()
-                results[target] = count
+        if USE_AIOHTTP:
+            results = asyncio.run(self._flood_nodes(target_nodes, 30))
+        else:
+            def flood_node(target: str):
+                count = 0
+                for _ in range(30):
+                    try:
+                        code, _ = self.api_call(target, "/node/info", timeout=1)
+                        if code == 200:
+                            count += 1
+                    except:
+                        pass
+                return target, count
+        
+            results = {}
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [executor.submit(flood_node, target) for target in target_nodes]
+                for future in futures:
+                    target, count = future.result()
+                    results[target] = count
         
         result_msg = f"向3节点各发30请求: {results}"
         log(f"[{node_name}] {result_msg}", "MALICIOUS")
@@ -591,26 +640,73 @@ class HeterogeneousNetworkTestLocal:
             result=result_msg
         ))
     
+    async def _flood_nodes(self, targets: List[str], n: int) -> Dict[str, int]:
+        """在单个事件循环中向每个目标并发发送 n 个请求，返回各目标成功数"""
+        connector = aiohttp.TCPConnector(limit=200, limit_per_host=100)
+        timeout = aiohttp.ClientTimeout(total=1)
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            async def send(url: str) -> bool:
+                try:
+                    async with session.get(url) as response:
+                        return response.status == 200
+                except Exception:
+                    return False
+            
+            async def flood(target: str):
+                port = NODES_CONFIG[target]['http_port']
+                url = f"http://127.0.0.1:{port}/api/node/info"
+                hits = await asyncio.gather(*(send(url) for _ in range(n)))
+                return target, sum(hits)
+            
+            return dict(await asyncio.gather(*(flood(t) for t in targets)))
+    
     # ==================== 监控 ====================
     
+    def _probe_node(self, node_name: str) -> tuple:
+        """检查单个节点健康状态与邻居数，返回 (是否健康, 邻居数)"""
+        port = NODES_CONFIG[node_name]['http_port']
+        try:
+            url = f"http://127.0.0.1:{port}/health"
+            ok = self._session(node_name).get(url, timeout=2).status_code == 200
+            return ok, len(self.get_neighbors(node_name))
+        except Exception:
+            return False, -1
+    
+    async def _probe_nodes(self, node_names: List[str]) -> List[tuple]:
+        """并发检查所有节点，结果顺序与 node_names 一致"""
+        timeout = aiohttp.ClientTimeout(total=2)
+        
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async def probe(node_name: str) -> tuple:
+                port = NODES_CONFIG[node_name]['http_port']
+                base = f"http://127.0.0.1:{port}"
+                try:
+                    async with session.get(f"{base}/health") as response:
+                        ok = response.status == 200
+                except Exception:
+                    return False, -1
+                try:
+                    async with session.get(f"{base}/api/neighbor/list") as response:
+                        data = await response.json(content_type=None) if response.status == 200 else {}
+                    neighbor_list = data.get("neighbors", []) if isinstance(data, dict) else []
+                except Exception:
+                    neighbor_list = []
+                return ok, len(neighbor_list)
+            
+            return await asyncio.gather(*(probe(name) for name in node_names))
+    
     def monitor_network(self) -> NetworkStats:
         """监控网络状态"""
-        healthy = 0
-        neighbors = {}
+        node_names = list(NODES_CONFIG)
+        if USE_AIOHTTP:
+            probes = asyncio.run(self._probe_nodes(node_names))
+        else:
+            with ThreadPoolExecutor(max_workers=len(node_names)) as executor:
+                probes = list(executor.map(self._probe_node, node_names))
         
-        for node_name, config in NODES_CONFIG.items():
-            port = config['http_port']
-            try:
-                url = f"http://127.0.0.1:{port}/health"
-                req = urllib.request.Request(url, method="GET")
-                with urllib.request.urlopen(req, timeout=2) as response:
-                    if response.status == 200:
-                        healthy += 1
-                
-                neighbor_list = self.get_neighbors(node_name)
-                neighbors[node_name] = len(neighbor_list)
-            except:
-                neighbors[node_name] = -1
+        healthy = sum(1 for ok, _ in probes if ok)
+        neighbors = {name: count for name, (_, count) in zip(node_names, probes)}
         
         stats = NetworkStats(
             timestamp=datetime.now().isoformat(),
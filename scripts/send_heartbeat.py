@@ -51,8 +51,12 @@ def calculate_protocol_hash(skill_path='../SKILL.md'):
 
 def sign_data(private_key, data):
     """对数据进行签名"""
+    payload = json.dumps(data, sort_keys=True).encode()
+    if not isinstance(private_key, ec.EllipticCurvePrivateKey):
+        # Ed25519 签名自带哈希，不需要指定算法
+        return private_key.sign(payload)
     return private_key.sign(
-        json.dumps(data, sort_keys=True).encode(),
+        payload,
         ec.ECDSA(hashlib.sha256())
     )
 